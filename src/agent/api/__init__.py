@@ -1,8 +1,11 @@
 # Import commonly used functions for backwards compatibility
+import importlib
+import sys
+import types
+
 from agent.config import Config
 from agent.security.decorators import protected
 
-from .app import app, create_app, main
 from .routes import (
     create_agent_card,
     get_request_handler,
@@ -14,6 +17,7 @@ from .routes import (
 __all__ = [
     "app",
     "create_app",
+    "get_app",
     "main",
     "create_agent_card",
     "get_request_handler",
@@ -23,3 +27,32 @@ __all__ = [
     "Config",
     "protected",
 ]
+
+
+def _app_module():
+    # import_module rather than `from . import app`, which would recurse into __getattr__
+    return importlib.import_module(f"{__name__}.app")
+
+
+class _ApiPackage(types.ModuleType):
+    # `app` names both the submodule and the FastAPI instance. As a data descriptor it wins over the
+    # binding the import system adds whenever agent.api.app is imported, whatever the import order.
+    @property
+    def app(self):
+        return _app_module().get_app()
+
+    @app.setter
+    def app(self, value):
+        # Drop the submodule binding; any other value replaces the app get_app() returns
+        if not isinstance(value, types.ModuleType):
+            _app_module()._app = value
+
+
+sys.modules[__name__].__class__ = _ApiPackage
+
+
+def __getattr__(name):
+    # The app module is imported on demand so route imports do not build the app
+    if name in ("create_app", "get_app", "main"):
+        return getattr(_app_module(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -206,8 +206,22 @@ def _configure_middleware(app: FastAPI) -> None:
         logger.debug("Basic request logging enabled")
 
 
-# Create the app instance
-app = create_app()
+# App instance, created on first access so importing this module does not load config or plugins
+_app: FastAPI | None = None
+
+
+def get_app() -> FastAPI:
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+def __getattr__(name: str):
+    # Keeps `agent.api.app:app` (uvicorn) and `from agent.api.app import app` working
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():
@@ -215,7 +229,7 @@ def main():
     port = int(os.getenv("SERVER_PORT", DEFAULT_SERVER_PORT))
 
     logger.info(f"Starting server on {host}:{port}")
-    uvicorn.run(app, host=host, port=port)
+    uvicorn.run(get_app(), host=host, port=port)
 
 
 if __name__ == "__main__":
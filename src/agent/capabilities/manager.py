@@ -479,10 +479,18 @@ def _resolve_state_config(plugin_name: str) -> dict:
 
 
 def _apply_auth_to_capability(executor: Callable, capability_id: str) -> Callable:
+    import inspect
     from functools import wraps
 
     from agent.security.context import create_capability_context, get_current_auth
 
+    # Check once whether the executor accepts a context parameter, not on every call
+    try:
+        accepts_context = len(inspect.signature(executor).parameters) > 1
+    except (ValueError, TypeError):
+        # Some builtins and C-extension callables can't be inspected; treat them as legacy executors
+        accepts_context = False
+
     @wraps(executor)
     async def auth_wrapped_executor(task):
         # Get current authentication information
@@ -491,12 +499,7 @@ def _apply_auth_to_capability(executor: Callable, capability_id: str) -> Callabl
         # Create capability context with authentication info
         capability_context = create_capability_context(task, auth_result)
 
-        # Check if executor accepts context parameter
-        import inspect
-
-        sig = inspect.signature(executor)
-
-        if len(sig.parameters) > 1:
+        if accepts_context:
             # Executor accepts context parameter
             return await executor(task, capability_context)
         else:
@@ -653,13 +656,13 @@ def register_capability_function(capability_id: str, executor: Callable[[Task],
 
 
 def get_capability_executor(capability_id: str) -> Callable[[Task], str] | None:
-    # Check unified capabilities registry
-    logger.debug(f"Available capabilities: {list(_capabilities.keys())}")
+    # Check unified capabilities registry; runs on every dispatch, so debug output is formatted lazily
     executor = _capabilities.get(capability_id)
     if executor is None:
         logger.warning(f"Capability '{capability_id}' not found in unified capabilities registry")
+        logger.debug("Available capabilities: %s", list(_capabilities))
         return None
-    logger.debug(f"Retrieved capability executor for '{capability_id}': {executor}")
+    logger.debug("Retrieved capability executor for '%s': %s", capability_id, executor)
     return executor
 
 
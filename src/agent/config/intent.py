@@ -314,15 +314,14 @@ def load_intent_config(file_path: str) -> IntentConfig:
     """Load intent configuration from a YAML file."""
     from pathlib import Path
 
-    import yaml
+    from .yaml_source import load_yaml_file
 
     path = Path(file_path)
     if not path.exists():
         # Return default config if file doesn't exist
         return IntentConfig(name="AgentUp Agent")
 
-    with open(path) as f:
-        data = yaml.safe_load(f) or {}
+    data = load_yaml_file(path) or {}
 
     # Add API version if missing
     if "apiVersion" not in data:
@@ -134,11 +134,15 @@ def setup_logging(config: LoggingConfig | None = None, json_logs: bool | None =
         shared_processors.append(structlog.processors.format_exc_info)
 
     structlog.configure(
-        processors=shared_processors
+        # Drop disabled levels before the rest of the chain; foreign stdlib records are already filtered
+        processors=[structlog.stdlib.filter_by_level]
+        + shared_processors
         + [
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         logger_factory=structlog.stdlib.LoggerFactory(),
+        # Leaves "%s" args to PositionalArgumentsFormatter, so they are only formatted for emitted events
+        wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
 
@@ -1,4 +1,7 @@
+import codecs
+import copy
 import os
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -8,6 +11,41 @@ from pydantic_settings import BaseSettings, PydanticBaseSettingsSource
 
 from .model import expand_env_vars
 
+# libyaml-backed safe loader when PyYAML was built with it, pure-Python otherwise
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Absolute path -> ((st_mtime_ns, st_size, st_ino), parsed document)
+_yaml_cache: dict[str, tuple[tuple[int, int, int], Any]] = {}
+_yaml_cache_lock = threading.Lock()
+
+
+def load_yaml_file(path: Path | str, encoding: str = "utf-8") -> Any:
+    """
+    Parse a YAML file, reusing the previous parse while the file is unchanged.
+
+    The file is re-read whenever its mtime, size or inode changes, so in-place edits and
+    atomic os.replace() writes are both picked up. Callers get their own copy of the document.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(key)
+    if cached is None or cached[0] != signature:
+        # UTF-8 is read as bytes so the loader decodes it itself (in C with libyaml)
+        if codecs.lookup(encoding).name == "utf-8":
+            with open(key, "rb") as f:
+                content = yaml.load(f, Loader=YAML_LOADER)  # nosec B506 - safe loader
+        else:
+            with open(key, encoding=encoding) as f:
+                content = yaml.load(f, Loader=YAML_LOADER)  # nosec B506 - safe loader
+        cached = (signature, content)
+        with _yaml_cache_lock:
+            _yaml_cache[key] = cached
+
+    return copy.deepcopy(cached[1])
+
 
 class YamlConfigSettingsSource(PydanticBaseSettingsSource):
     """
@@ -32,21 +70,17 @@ class YamlConfigSettingsSource(PydanticBaseSettingsSource):
         if env_config_path:
             self.yaml_file = Path(env_config_path)
 
-        if not self.yaml_file.exists():
-            return {}
-
         try:
-            with open(self.yaml_file, encoding=self.yaml_file_encoding) as f:
-                content = yaml.safe_load(f)
-                if content is None:
-                    return {}
+            content = load_yaml_file(self.yaml_file, self.yaml_file_encoding)
+            if content is None:
+                return {}
 
-                if "name" in content and "project_name" not in content:
-                    content["project_name"] = content["name"]
-                # Apply environment variable expansion
-                expanded_content = expand_env_vars(content)
+            if "name" in content and "project_name" not in content:
+                content["project_name"] = content["name"]
+            # Apply environment variable expansion
+            expanded_content = expand_env_vars(content)
 
-                return expanded_content if isinstance(expanded_content, dict) else {}
+            return expanded_content if isinstance(expanded_content, dict) else {}
         except Exception:
             # If there's any error reading the file, return empty dict
             return {}
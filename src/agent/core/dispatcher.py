@@ -1,5 +1,5 @@
 from collections.abc import Callable
-from typing import Any
+from typing import Any, cast
 
 import structlog
 from a2a.types import Task
@@ -12,6 +12,9 @@ from .function_executor import FunctionExecutor
 
 logger = structlog.get_logger(__name__)
 
+# getattr default that keeps hasattr() semantics: an attribute explicitly set to None still counts as present
+_MISSING = object()
+
 
 class FunctionRegistry:
     """
@@ -629,8 +632,8 @@ def register_ai_functions_from_capabilities():
                     module_attr_name = module_name
 
                     # Try to get the module from the capabilities package
-                    if hasattr(capabilities_pkg, module_attr_name):
-                        executor_module = getattr(capabilities_pkg, module_attr_name)
+                    executor_module = getattr(capabilities_pkg, module_attr_name, _MISSING)
+                    if executor_module is not _MISSING:
                         if executor_module not in executor_modules:
                             executor_modules.append(executor_module)
                             logger.debug(f"Added dynamically discovered capability module: {module_name}")
@@ -666,11 +669,13 @@ def register_ai_functions_from_capabilities():
     for executor_module in executor_modules:
         logger.debug(f"Scanning capability modules {executor_module.__name__} for AI functions")
         ai_functions_in_module = 0
-        for name in dir(executor_module):
-            obj = getattr(executor_module, name)
+        # Module namespace directly: dir() would build and sort a name list, then getattr each entry
+        for name, obj in list(vars(executor_module).items()):
             if callable(obj):
-                has_ai_flag = hasattr(obj, "_is_ai_function")
-                has_schema = hasattr(obj, "_ai_function_schema")
+                # One lookup per attribute instead of hasattr() followed by a second fetch
+                has_ai_flag = getattr(obj, "_is_ai_function", _MISSING) is not _MISSING
+                schema = getattr(obj, "_ai_function_schema", _MISSING)
+                has_schema = schema is not _MISSING
 
                 # Only log functions that might be AI functions (start with handle_ or have AI attributes)
                 # TODO: We can likely drop this, its from a debugging phase (Luke), but will keep for now
@@ -681,9 +686,9 @@ def register_ai_functions_from_capabilities():
                     )
 
                 if has_ai_flag and has_schema:
-                    schema = obj._ai_function_schema  # type: ignore[attr-defined]
-                    registry.register_function(schema["name"], obj, schema)
-                    logger.debug(f"Auto-registered AI function: {schema['name']} from {name}")
+                    function_schema = cast(dict[str, Any], schema)
+                    registry.register_function(function_schema["name"], obj, function_schema)
+                    logger.debug(f"Auto-registered AI function: {function_schema['name']} from {name}")
                     registered_count += 1
                     ai_functions_in_module += 1
 
@@ -8,8 +8,10 @@ the decorator-based plugin system instead of Pluggy hooks.
 import importlib
 import importlib.metadata
 import importlib.util
+import os
 import sys
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
 import structlog
@@ -45,6 +47,13 @@ class PluginRegistry:
         self.plugin_definitions: dict[str, PluginDefinition] = {}
         self.capabilities: dict[str, CapabilityMetadata] = {}
         self.capability_to_plugin: dict[str, str] = {}
+        # Capability definitions are built once, at registration
+        self.capability_definitions: dict[str, CapabilityDefinition] = {}
+        # Plugins that failed to load, with the dist version or entry file mtime they failed at. Discovery
+        # can run more than once; a failed plugin is only retried once that source has changed.
+        self._failed_plugins: dict[str, Any] = {}
+        # Filesystem plugin modules by name, with the entry file mtime they were executed from
+        self._fs_modules: dict[str, tuple[int, ModuleType]] = {}
 
         # Store configuration
         self._config = config
@@ -52,7 +61,7 @@ class PluginRegistry:
         # Enhanced plugin security system
         self.security_mode = "configured"  # "allowlist", "configured", "permissive"
         self.allowed_plugins: dict[str, dict] | None = None
-        self.blocked_plugins: list[str] = []
+        self.blocked_plugins: set[str] = set()
         self.allowlist_load_failed = False
         self._load_plugin_security_config()
 
@@ -73,14 +82,14 @@ class PluginRegistry:
         """Load plugin security configuration with enhanced modes and validation"""
         try:
             config = self.config
-            logger.debug(f"Loading plugin security config from: {config}")
+            logger.debug("Loading plugin security config from: %s", config)
             security_config = config.get("plugin_security", {})
 
             # Set security mode
             self.security_mode = security_config.get("mode", "configured")
 
-            # Load blocked plugins
-            self.blocked_plugins = security_config.get("blocked_plugins", [])
+            # Load blocked plugins; kept as a set so each allow check is one lookup
+            self.blocked_plugins = set(security_config.get("blocked_plugins", []))
 
             if self.security_mode == "allowlist":
                 # Explicit allowlist mode - only specified plugins allowed
@@ -93,7 +102,7 @@ class PluginRegistry:
             else:
                 # Configured mode (default) - allow explicitly configured plugins
                 configured_plugins = config.get("plugins", {})
-                logger.debug(f"Configured plugins loaded: {configured_plugins}")
+                logger.debug("Configured plugins loaded: %s", configured_plugins)
 
                 # Initialize empty allowlist - will be set to None if error occurs
                 allowed_plugins_temp = {}
@@ -105,7 +114,7 @@ class PluginRegistry:
                 # Handle dictionary format - simple exact name matching only
                 for package_name, plugin_config in configured_plugins.items():
                     logger.debug(
-                        f"Processing plugin entry: package_name='{package_name}', plugin_config={plugin_config}"
+                        "Processing plugin entry: package_name='%s', plugin_config=%s", package_name, plugin_config
                     )
                     plugin_info = {"package": package_name}
                     allowed_plugins_temp[package_name] = plugin_info
@@ -113,8 +122,8 @@ class PluginRegistry:
                 # Successfully processed all plugins, assign to actual field
                 self.allowed_plugins = allowed_plugins_temp
                 logger.info(f"Security mode: configured with {len(self.allowed_plugins)} allowed plugins")
-                logger.debug(f"Allowed plugin keys: {list(self.allowed_plugins.keys())}")
-                logger.debug(f"Complete allowlist contents: {self.allowed_plugins}")
+                logger.debug("Allowed plugin keys: %s", list(self.allowed_plugins))
+                logger.debug("Complete allowlist contents: %s", self.allowed_plugins)
 
         except Exception as e:
             logger.error(f"Failed to load plugin security configuration: {e}")
@@ -160,13 +169,18 @@ class PluginRegistry:
                 return
 
             for entry_point in plugin_entries:
+                dist_version = getattr(entry_point.dist, "version", None)
+                if entry_point.name in self._failed_plugins and self._failed_plugins[entry_point.name] == dist_version:
+                    logger.debug("Skipping plugin '%s', it failed to load earlier", entry_point.name)
+                    continue
+
                 try:
                     # Check if plugin is allowed
                     if not self._is_plugin_allowed(entry_point.name, entry_point.dist):
                         logger.warning(f"Plugin '{entry_point.name}' not in allowlist, skipping")
                         continue
 
-                    logger.debug(f"Loading plugin: {entry_point.name}")
+                    logger.debug("Loading plugin: %s", entry_point.name)
 
                     # Load plugin class
                     plugin_class = entry_point.load()
@@ -174,6 +188,7 @@ class PluginRegistry:
                     # Validate it's a Plugin subclass
                     if not issubclass(plugin_class, Plugin):
                         logger.error(f"Plugin {entry_point.name} does not inherit from Plugin base class")
+                        self._failed_plugins[entry_point.name] = dist_version
                         continue
 
                     # Instantiate plugin
@@ -181,11 +196,13 @@ class PluginRegistry:
 
                     # Register the plugin
                     self._register_plugin(entry_point.name, plugin_instance, entry_point)
+                    self._failed_plugins.pop(entry_point.name, None)
 
                 except Exception as e:
                     logger.error(f"Failed to load plugin {entry_point.name}: {e}", exc_info=True)
 
                     # Track failed plugin
+                    self._failed_plugins[entry_point.name] = dist_version
                     self.plugin_definitions[entry_point.name] = PluginDefinition(
                         name=entry_point.name,
                         version="0.0.0",
@@ -217,18 +234,22 @@ class PluginRegistry:
             for dir_path in allowed_dirs:
                 expanded_path = Path(dir_path).expanduser()
 
-                if not expanded_path.exists():
-                    logger.debug(f"Plugin directory not found: {expanded_path}")
+                # scandir's dirent type answers is_dir() without a stat per entry; a missing
+                # directory surfaces as an error here instead of costing a separate exists() stat
+                try:
+                    with os.scandir(expanded_path) as entries:
+                        plugin_dirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+                except (FileNotFoundError, NotADirectoryError):
+                    logger.debug("Plugin directory not found: %s", expanded_path)
                     continue
 
                 logger.info(f"Loading filesystem plugins from: {expanded_path}")
 
-                for plugin_dir in expanded_path.iterdir():
-                    if plugin_dir.is_dir():
-                        try:
-                            self._load_filesystem_plugin(plugin_dir)
-                        except Exception as e:
-                            logger.error(f"Failed to load filesystem plugin from {plugin_dir}: {e}")
+                for plugin_dir in plugin_dirs:
+                    try:
+                        self._load_filesystem_plugin(plugin_dir)
+                    except Exception as e:
+                        logger.error(f"Failed to load filesystem plugin from {plugin_dir}: {e}")
 
         except Exception as e:
             logger.error(f"Error loading filesystem plugins: {e}")
@@ -237,24 +258,46 @@ class PluginRegistry:
         """Load a single plugin from filesystem directory"""
         plugin_name = f"fs_{plugin_dir.name}"
 
-        # Look for plugin entry file
-        entry_file = None
-        if (plugin_dir / "plugin.py").exists():
-            entry_file = plugin_dir / "plugin.py"
-        elif (plugin_dir / "__init__.py").exists():
-            entry_file = plugin_dir / "__init__.py"
-        else:
+        # Blocked plugins are skipped before touching the directory or running any code
+        if plugin_name in self.blocked_plugins or plugin_dir.name in self.blocked_plugins:
+            logger.warning(f"Filesystem plugin '{plugin_name}' is explicitly blocked")
+            return
+
+        # Look for plugin entry file with one directory read instead of an exists() stat per candidate
+        with os.scandir(plugin_dir) as entries:
+            candidates = {entry.name: entry for entry in entries if entry.name in ("plugin.py", "__init__.py")}
+        entry = candidates.get("plugin.py") or candidates.get("__init__.py")
+        mtime = entry.stat().st_mtime_ns if entry is not None else None
+
+        if plugin_name in self._failed_plugins and self._failed_plugins[plugin_name] == mtime:
+            logger.debug("Skipping filesystem plugin '%s', it failed to load earlier", plugin_name)
+            return
+
+        if entry is None or mtime is None:
             logger.warning(f"No plugin.py or __init__.py found in {plugin_dir}")
+            self._failed_plugins[plugin_name] = None
             return
 
-        # Load module
-        spec = importlib.util.spec_from_file_location(plugin_name, entry_file)
-        if spec is None or spec.loader is None:
-            raise ValueError(f"Could not load plugin from {entry_file}")
+        try:
+            self._load_filesystem_plugin_entry(plugin_name, plugin_dir, Path(entry.path), mtime)
+        except Exception:
+            self._failed_plugins[plugin_name] = mtime
+            raise
+
+    def _load_filesystem_plugin_entry(self, plugin_name: str, plugin_dir: Path, entry_file: Path, mtime: int) -> None:
+        # Reuse the module from an earlier discovery pass while the entry file is unchanged
+        cached = self._fs_modules.get(plugin_name)
+        if cached is not None and cached[0] == mtime:
+            module = cached[1]
+        else:
+            spec = importlib.util.spec_from_file_location(plugin_name, entry_file)
+            if spec is None or spec.loader is None:
+                raise ValueError(f"Could not load plugin from {entry_file}")
 
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[plugin_name] = module
-        spec.loader.exec_module(module)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[plugin_name] = module
+            spec.loader.exec_module(module)
+            self._fs_modules[plugin_name] = (mtime, module)
 
         # Find Plugin class
         plugin_class = None
@@ -265,11 +308,13 @@ class PluginRegistry:
 
         if plugin_class is None:
             logger.warning(f"No Plugin subclass found in {entry_file}")
+            self._failed_plugins[plugin_name] = mtime
             return
 
         # Instantiate and register
         plugin_instance = plugin_class()
         self._register_plugin(plugin_name, plugin_instance, None, source="filesystem", path=str(plugin_dir))
+        self._failed_plugins.pop(plugin_name, None)
 
         logger.info(f"Loaded filesystem plugin '{plugin_name}' from {plugin_dir}")
 
@@ -296,12 +341,12 @@ class PluginRegistry:
 
         if not self.allowed_plugins:
             # Explicit empty allowlist means no plugins allowed
-            logger.debug(f"Empty plugin allowlist, denying plugin '{package_name}'")
+            logger.debug("Empty plugin allowlist, denying plugin '%s'", package_name)
             return False
 
         # Check if package name is in allowlist (now keyed by package names)
         if package_name not in self.allowed_plugins:
-            logger.debug(f"Plugin '{package_name}' not in allowlist (mode: {self.security_mode})")
+            logger.debug("Plugin '%s' not in allowlist (mode: %s)", package_name, self.security_mode)
             return False
 
         return True
@@ -327,8 +372,9 @@ class PluginRegistry:
                 capability_meta = plugin_instance._capabilities[cap_def.id]
                 self.capabilities[cap_def.id] = capability_meta
                 self.capability_to_plugin[cap_def.id] = plugin_name
+                self.capability_definitions[cap_def.id] = cap_def
 
-                logger.debug(f"Registered capability '{cap_def.id}' from plugin '{plugin_name}'")
+                logger.debug("Registered capability '%s' from plugin '%s'", cap_def.id, plugin_name)
 
             # Create plugin definition
             version = "1.0.0"  # Default version
@@ -454,7 +500,7 @@ class PluginRegistry:
         if plugin_name in self.plugins:
             try:
                 self.plugins[plugin_name].configure(config)
-                logger.debug(f"Configured plugin {plugin_name}")
+                logger.debug("Configured plugin %s", plugin_name)
             except Exception as e:
                 logger.error(f"Failed to configure plugin {plugin_name}: {e}")
 
@@ -462,17 +508,7 @@ class PluginRegistry:
 
     def get_capability(self, capability_id: str) -> CapabilityDefinition | None:
         """Get capability definition by ID"""
-        if capability_id not in self.capability_to_plugin:
-            return None
-
-        plugin_name = self.capability_to_plugin[capability_id]
-        plugin = self.plugins[plugin_name]
-
-        for cap_def in plugin.get_capability_definitions():
-            if cap_def.id == capability_id:
-                return cap_def
-
-        return None
+        return self.capability_definitions.get(capability_id)
 
     def list_capabilities(self) -> list[CapabilityDefinition]:
         """Get all capability definitions"""
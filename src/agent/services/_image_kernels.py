@@ -0,0 +1,40 @@
+# Numba kernels for image statistics. Importing this module raises ImportError when
+# numba is not installed; callers fall back to the NumPy implementation.
+import numba
+import numpy as np
+from numba import njit, prange
+
+# Number of row blocks reduced in parallel; each block keeps its own partial sums
+_SUM_BLOCKS = 64
+
+# The workqueue layer aborts the process when parallel kernels are entered from several threads at once
+_THREADSAFE_LAYERS = frozenset({"tbb", "omp"})
+
+
+# No cache=True: the on-disk cache needs a writable package or cache directory, which read-only
+# installs lack, and warm_up() compiles the kernel at startup anyway
+@njit(parallel=True)
+def channel_sums_u8(pixels):
+    # pixels is an (N, C) uint8 array; returns per-channel uint64 sums in a single pass
+    n, channels = pixels.shape
+    partial = np.zeros((_SUM_BLOCKS, channels), np.uint64)
+    step = (n + _SUM_BLOCKS - 1) // _SUM_BLOCKS
+    for block in prange(_SUM_BLOCKS):
+        start = block * step
+        end = min(start + step, n)
+        for i in range(start, end):
+            for c in range(channels):
+                partial[block, c] += pixels[i, c]
+
+    sums = np.zeros(channels, np.uint64)
+    for block in range(_SUM_BLOCKS):
+        for c in range(channels):
+            sums[c] += partial[block, c]
+    return sums
+
+
+def warm_up() -> bool:
+    # Compile channel_sums_u8 and report whether it is safe to call from concurrent request threads
+    channel_sums_u8(np.zeros((4, 3), np.uint8))
+    # Only known once a parallel kernel has run
+    return numba.threading_layer() in _THREADSAFE_LAYERS
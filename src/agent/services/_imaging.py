@@ -0,0 +1,118 @@
+# numpy/Pillow/OpenCV-backed helpers for MultiModalProcessor.
+# Kept out of multimodal.py so these heavy imports only happen on first image processing.
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+import structlog
+from PIL import Image
+
+cv2: ModuleType | None
+try:
+    # OpenCV decodes straight into an ndarray via libjpeg-turbo/libpng SIMD paths
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    CV2_AVAILABLE = False
+
+_image_kernels: ModuleType | None
+try:
+    # Multi-threaded single-pass channel reduction, used for large color images
+    from agent.services import _image_kernels
+
+    NUMBA_AVAILABLE = True
+except Exception:
+    # Not only ImportError: a broken numba install can fail in other ways, and must not break image processing
+    _image_kernels = None
+    NUMBA_AVAILABLE = False
+
+# Set by warm_up(); until then the NumPy path is used, so no request ever pays the JIT compile
+_kernel_ready = False
+
+logger = structlog.get_logger(__name__)
+
+# Below this many pixels the NumPy reduction is already cheaper than dispatching to the kernel
+_NUMBA_MIN_PIXELS = 512 * 512
+
+# np.std(..., mean=...) reuses a precomputed mean (NumPy >= 2.0)
+_NP_STD_ACCEPTS_MEAN = np.lib.NumpyVersion(np.__version__) >= "2.0.0"
+
+# PIL modes OpenCV can decode to an identical array, with the expected channel count and BGR->RGB conversion
+_CV2_DECODE_MODES = {
+    "L": (None, None),
+    "RGB": (3, "COLOR_BGR2RGB"),
+    "RGBA": (4, "COLOR_BGRA2RGBA"),
+}
+
+
+def warm_up() -> bool:
+    # Compile the optional Numba kernel at startup; returns whether image statistics will use it
+    global _kernel_ready
+    if _image_kernels is not None and not _kernel_ready:
+        try:
+            _kernel_ready = _image_kernels.warm_up()
+            if not _kernel_ready:
+                logger.info("Numba image kernel disabled: no thread-safe threading layer (tbb/omp)")
+        except Exception as e:
+            logger.warning("Numba image kernel unavailable, using NumPy", error=str(e))
+    return _kernel_ready
+
+
+def decode_pixels(image_bytes: bytes, image: Image.Image) -> np.ndarray:
+    if cv2 is not None and image.mode in _CV2_DECODE_MODES:
+        channels, conversion = _CV2_DECODE_MODES[image.mode]
+        array: np.ndarray | None = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_UNCHANGED)
+        expected_shape = (image.height, image.width) if channels is None else (image.height, image.width, channels)
+        if array is not None and array.dtype == np.uint8 and array.shape == expected_shape:
+            if conversion is not None:
+                array = cv2.cvtColor(array, getattr(cv2, conversion))
+            return array
+
+    # Fall back to PIL for formats/modes OpenCV can't reproduce exactly (GIF, palette, 16-bit, ...)
+    return np.array(image)
+
+
+# Pixel values 0..255 and their squares, for exact integer moments of 8-bit images
+_U8_VALUES = np.arange(256, dtype=np.int64)
+_U8_SQUARES = _U8_VALUES * _U8_VALUES
+
+
+def image_statistics(image_array: np.ndarray) -> dict[str, Any]:
+    stats: dict[str, Any] = {}
+
+    if image_array.dtype == np.uint8:
+        # Keep 8-bit pixels 8-bit until the reduction instead of promoting to float64
+        if image_array.ndim == 2:  # Grayscale
+            histogram = np.bincount(image_array.ravel(), minlength=256)
+            count = image_array.size
+            mean = int(histogram @ _U8_VALUES) / count
+            variance = int(histogram @ _U8_SQUARES) / count - mean * mean
+            stats["mean_brightness"] = mean
+            stats["std_brightness"] = max(variance, 0.0) ** 0.5
+        elif image_array.ndim == 3:  # Color
+            pixels = image_array.reshape(-1, image_array.shape[2])
+            if _kernel_ready and _image_kernels is not None and pixels.shape[0] >= _NUMBA_MIN_PIXELS:
+                sums = _image_kernels.channel_sums_u8(pixels)
+            else:
+                sums = pixels.sum(axis=0, dtype=np.uint64)
+            pixel_count = image_array.shape[0] * image_array.shape[1]
+            stats["mean_brightness"] = int(sums.sum()) / image_array.size
+            stats["channel_means"] = [int(total) / pixel_count for total in sums]
+        return stats
+
+    if image_array.ndim == 2:  # Grayscale
+        mean = np.mean(image_array)
+        stats["mean_brightness"] = float(mean)
+        if _NP_STD_ACCEPTS_MEAN:
+            stats["std_brightness"] = float(np.std(image_array, mean=mean))
+        else:
+            stats["std_brightness"] = float(np.std(image_array))
+    elif image_array.ndim == 3:  # Color
+        # Single reduction over all pixels yields every channel mean at once
+        channel_means = image_array.reshape(-1, image_array.shape[2]).mean(axis=0)
+        stats["mean_brightness"] = float(channel_means.mean())
+        stats["channel_means"] = channel_means.tolist()
+
+    return stats
@@ -1,19 +1,230 @@
+from __future__ import annotations
+
+import asyncio
 import base64
+import binascii
+import copy
 import hashlib
+import importlib.util
 import io
 import json
 import mimetypes
+import mmap
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
 import structlog
 from a2a.types import DataPart, FilePart, FileWithBytes, Part
-from PIL import Image
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib base64 codec
+    import pybase64
+
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    pybase64 = None  # type: ignore[assignment]
+    PYBASE64_AVAILABLE = False
+
+try:
+    # Parses straight from bytes, skipping the separate UTF-8 decode pass
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
+try:
+    # Non-cryptographic SIMD hash, used for content fingerprints and deduplication hashes
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None  # type: ignore[assignment]
+    XXHASH_AVAILABLE = False
 
 logger = structlog.get_logger(__name__)
 
 
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _dedup_hash(data: bytes) -> tuple[str, str]:
+    # Deduplication needs no cryptographic strength, so prefer the much faster xxh3 when available
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_hexdigest(data), "xxh3_128"
+    return _sha256(data), "sha256"
+
+
+def _decode_and_hash(b64_data: str) -> tuple[bytes, str, str]:
+    # Hash the decoded buffer straight away, while it is still cache-resident
+    decoded = _b64decode(b64_data)
+    return decoded, *_dedup_hash(decoded)
+
+
+def _add_sha256(metadata: dict[str, Any], data: bytes) -> None:
+    # SHA-256 is reserved for integrity/audit callers that explicitly ask for it
+    if metadata.get("hash_algo") == "sha256":
+        metadata["sha256"] = metadata["hash"]
+    else:
+        metadata["sha256"] = _sha256(data)
+
+
+# Attribute on PIL images opened by process_image holding (source bytes, size, mode)
+_SOURCE_BYTES_ATTR = "_agentup_source_bytes"
+
+
+def _open_image(image_bytes: bytes) -> Image.Image:
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_bytes))
+    setattr(image, _SOURCE_BYTES_ATTR, (image_bytes, image.size, image.mode))
+    return image
+
+
+def _is_unmodified(image: Image.Image, source_bytes: bytes) -> bool:
+    from PIL import Image
+
+    # In-place edits (ImageDraw, paste, putpixel) leave size and mode alone, so compare decoded pixels
+    if getattr(image, "n_frames", 1) != 1:
+        return False
+    original = Image.open(io.BytesIO(source_bytes))
+    return original.getpalette() == image.getpalette() and original.tobytes() == image.tobytes()
+
+
+# image.info keys describing encoding rather than content; anything else (EXIF, XMP, comments,
+# PNG text chunks) is metadata that a Pillow re-encode drops but the source bytes still carry
+_ENCODING_INFO_KEYS = frozenset(
+    {
+        "adobe",
+        "adobe_transform",
+        "aspect",
+        "background",
+        "compression",
+        "dpi",
+        "duration",
+        "extension",
+        "gamma",
+        "icc_profile",
+        "interlace",
+        "jfif",
+        "jfif_density",
+        "jfif_unit",
+        "jfif_version",
+        "lossless",
+        "loop",
+        "progression",
+        "progressive",
+        "srgb",
+        "transparency",
+        "version",
+    }
+)
+
+
+def _has_metadata(image: Image.Image) -> bool:
+    return not _ENCODING_INFO_KEYS.issuperset(image.info) or len(image.getexif()) > 0
+
+
+# Text is word-counted in slices so large documents never build a full list of words
+_WORD_COUNT_CHUNK_SIZE = 1024 * 1024
+
+
+def _count_words(text: str) -> int:
+    count = 0
+    previous_ends_in_word = False
+    for offset in range(0, len(text), _WORD_COUNT_CHUNK_SIZE):
+        chunk = text[offset : offset + _WORD_COUNT_CHUNK_SIZE]
+        count += len(chunk.split())
+        # A word straddling the slice boundary was counted once on each side
+        if previous_ends_in_word and not chunk[0].isspace():
+            count -= 1
+        previous_ends_in_word = not chunk[-1].isspace()
+    return count
+
+
+# orjson turns integers outside the 64-bit range into floats; any run this long may be one,
+# including 19-digit negatives below the int64 minimum
+_WIDE_INTEGER = re.compile(rb"\d{19}")
+
+
+def _json_loads(data: bytes) -> Any:
+    if ORJSON_AVAILABLE and not _WIDE_INTEGER.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some input the stdlib accepts (NaN/Infinity literals); let json decide
+            pass
+    return json.loads(data.decode("utf-8"))
+
+
+def _b64decode(data: str | bytes) -> bytes:
+    if PYBASE64_AVAILABLE:
+        try:
+            # Strict mode accepts only canonical base64, where pybase64 and the stdlib agree
+            return pybase64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError):
+            # Line-wrapped or non-canonical input goes to the stdlib so the result never depends on pybase64
+            pass
+    return base64.b64decode(data, validate=False)
+
+
+def _b64encode_str(data: bytes | mmap.mmap) -> str:
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+# Bounded LRU of image metadata (never file content), keyed by the content hash process_image computes anyway
+class _ResultCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str, str], tuple[dict[str, Any], int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, str]) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        # Hand out copies so callers can't mutate the cached entry
+        return copy.deepcopy(entry[0])
+
+    def put(self, key: tuple[str, str, str], metadata: dict[str, Any]) -> None:
+        # Approximate footprint; metadata holds only short strings, numbers and small lists
+        cost = len(repr(metadata))
+        if cost > self.max_bytes:
+            return
+        metadata = copy.deepcopy(metadata)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (metadata, cost)
+            self._total_bytes += cost
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_cost
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+
+_result_cache = _ResultCache(max_bytes=256 * 1024)
+
+
 class MultiModalProcessor:
     # Supported image formats
     IMAGE_FORMATS = {
@@ -34,79 +245,102 @@ class MultiModalProcessor:
         "application/json": [".json"],
     }
 
+    # Precomputed membership set for document mime types
+    _DOC_MIME = frozenset(DOCUMENT_FORMATS)
+
+    # Known mime types resolved to their extract_all_content bucket with a single dict lookup
+    _MIME_BUCKETS = {**dict.fromkeys(IMAGE_FORMATS, "images"), **dict.fromkeys(DOCUMENT_FORMATS, "documents")}
+
     # File size limits (in MB)
     MAX_FILE_SIZES = {"image": 10, "document": 50, "default": 100}
 
+    @staticmethod
+    def _iter_file_parts(parts: list[Part]) -> Iterator[tuple[Part, Any, str | None]]:
+        # Yield (part, file, mime_type) for every FilePart, resolving part.root only once
+        for part in parts:
+            root = getattr(part, "root", None)
+            if root is not None and root.kind == "file":
+                file_obj = root.file
+                yield part, file_obj, file_obj.mimeType
+
+    @staticmethod
+    def _file_info(file_obj: Any, mime_type: str, default_name: str) -> dict[str, Any]:
+        # Return dict with file info for easier processing
+        return {
+            "name": file_obj.name or default_name,
+            "mimeType": mime_type,
+            "data": file_obj.bytes if hasattr(file_obj, "bytes") else None,
+            "uri": file_obj.uri if hasattr(file_obj, "uri") else None,
+        }
+
     @classmethod
-    def extract_parts_by_type(cls, parts: list[Part], mime_type_prefix: str) -> list[Part]:
+    def extract_parts_by_type(cls, parts: list[Part], mime_type_prefix: str | tuple[str, ...]) -> list[Part]:
         matching_parts = []
 
         for part in parts:
+            root = getattr(part, "root", None)
+            if root is None:
+                continue
             # Check FilePart (for images, documents, etc.)
-            if hasattr(part, "root") and part.root.kind == "file":
-                file_part = part.root
-                if file_part.file.mimeType and file_part.file.mimeType.startswith(mime_type_prefix):
-                    matching_parts.append(part)
+            if root.kind == "file":
+                mime_type = root.file.mimeType
             # Check DataPart (for structured data)
-            elif hasattr(part, "root") and part.root.kind == "data":
-                data_part = part.root
-                if (
-                    hasattr(data_part, "mimeType")
-                    and data_part.mimeType
-                    and data_part.mimeType.startswith(mime_type_prefix)
-                ):
-                    matching_parts.append(part)
+            elif root.kind == "data":
+                mime_type = getattr(root, "mimeType", None)
+            else:
+                continue
+            if mime_type and mime_type.startswith(mime_type_prefix):
+                matching_parts.append(part)
 
         return matching_parts
 
     @classmethod
     def extract_image_parts(cls, parts: list[Part]) -> list[dict[str, str]]:
-        image_parts = []
-
-        for part in parts:
-            # Images should be FilePart according to A2A spec
-            if hasattr(part, "root") and part.root.kind == "file":
-                file_part = part.root
-                if file_part.file.mimeType and file_part.file.mimeType.startswith("image/"):
-                    # Return dict with file info for easier processing
-                    image_info = {
-                        "name": file_part.file.name or "image",
-                        "mimeType": file_part.file.mimeType,
-                        "data": file_part.file.bytes if hasattr(file_part.file, "bytes") else None,
-                        "uri": file_part.file.uri if hasattr(file_part.file, "uri") else None,
-                    }
-                    image_parts.append(image_info)
-
-        return image_parts
+        # Images should be FilePart according to A2A spec
+        return [
+            cls._file_info(file_obj, mime_type, "image")
+            for _, file_obj, mime_type in cls._iter_file_parts(parts)
+            if mime_type and mime_type.startswith("image/")
+        ]
 
     @classmethod
     def extract_document_parts(cls, parts: list[Part]) -> list[dict[str, str]]:
-        doc_parts = []
-
-        for part in parts:
-            # Documents should be FilePart according to A2A spec
-            if hasattr(part, "root") and part.root.kind == "file":
-                file_part = part.root
-                if file_part.file.mimeType and file_part.file.mimeType in cls.DOCUMENT_FORMATS:
-                    # Return dict with file info for easier processing
-                    doc_info = {
-                        "name": file_part.file.name or "document",
-                        "mimeType": file_part.file.mimeType,
-                        "data": file_part.file.bytes if hasattr(file_part.file, "bytes") else None,
-                        "uri": file_part.file.uri if hasattr(file_part.file, "uri") else None,
-                    }
-                    doc_parts.append(doc_info)
-
-        return doc_parts
+        # Documents should be FilePart according to A2A spec
+        doc_mime = cls._DOC_MIME
+        return [
+            cls._file_info(file_obj, mime_type, "document")
+            for _, file_obj, mime_type in cls._iter_file_parts(parts)
+            if mime_type in doc_mime
+        ]
 
     @classmethod
-    def process_image(cls, image_data: str, mime_type: str) -> dict[str, Any]:
+    def process_image(
+        cls,
+        image_data: str,
+        mime_type: str,
+        compute_stats: bool = True,
+        compute_hash: bool = True,
+        compute_sha256: bool = False,
+    ) -> dict[str, Any]:
         try:
-            # Decode base64 data
-            image_bytes = base64.b64decode(image_data)
-
-            # Open image with PIL
-            image = Image.open(io.BytesIO(image_bytes))
+            # Decode base64 data, hashing it for deduplication if requested
+            cache_key = None
+            if compute_hash:
+                image_bytes, image_hash, hash_algo = _decode_and_hash(image_data)
+                cache_key = (mime_type, hash_algo, image_hash)
+            else:
+                image_bytes = _b64decode(image_data)
+
+            # Open image with PIL (reads the header only; pixels are decoded on demand)
+            image = _open_image(image_bytes)
+
+            # Repeat uploads skip pixel decoding and statistics
+            if compute_stats and cache_key is not None:
+                cached_metadata = _result_cache.get(cache_key)
+                if cached_metadata is not None:
+                    if compute_sha256:
+                        _add_sha256(cached_metadata, image_bytes)
+                    return {"success": True, "metadata": cached_metadata, "image": image}
 
             # Extract metadata
             metadata = {
@@ -118,23 +352,30 @@ class MultiModalProcessor:
                 "mime_type": mime_type,
             }
 
-            # Convert to numpy array for processing
-            image_array = np.array(image)
+            if compute_stats:
+                # numpy/OpenCV helpers live in a separate module so they're only imported when needed
+                from agent.services import _imaging
+
+                # Decode pixels into a numpy array for processing
+                image_array = _imaging.decode_pixels(image_bytes, image)
+
+                # Basic image analysis
+                metadata["shape"] = image_array.shape
+                metadata["dtype"] = str(image_array.dtype)
 
-            # Basic image analysis
-            metadata["shape"] = image_array.shape
-            metadata["dtype"] = str(image_array.dtype)
+                # Calculate basic statistics
+                metadata.update(_imaging.image_statistics(image_array))
 
-            # Calculate basic statistics
-            if len(image_array.shape) == 2:  # Grayscale
-                metadata["mean_brightness"] = float(np.mean(image_array))
-                metadata["std_brightness"] = float(np.std(image_array))
-            elif len(image_array.shape) == 3:  # Color
-                metadata["mean_brightness"] = float(np.mean(image_array))
-                metadata["channel_means"] = [float(np.mean(image_array[:, :, i])) for i in range(image_array.shape[2])]
+            if compute_hash:
+                metadata["hash"] = image_hash
+                metadata["hash_algo"] = hash_algo
 
-            # Generate hash for deduplication
-            metadata["hash"] = hashlib.sha256(image_bytes).hexdigest()
+            if compute_stats and cache_key is not None:
+                # Cache only what every caller gets; sha256 is added per request
+                _result_cache.put(cache_key, metadata)
+
+            if compute_sha256:
+                _add_sha256(metadata, image_bytes)
 
             return {
                 "success": True,
@@ -146,6 +387,39 @@ class MultiModalProcessor:
             logger.error(f"Failed to process image: {e}")
             return {"success": False, "error": str(e)}
 
+    @classmethod
+    def process_image_lite(
+        cls,
+        image_data: str,
+        mime_type: str,
+        compute_stats: bool = False,
+        compute_hash: bool = False,
+        compute_sha256: bool = False,
+    ) -> dict[str, Any]:
+        # Header-only metadata (format, mode, size) without decoding pixels or hashing
+        return cls.process_image(
+            image_data,
+            mime_type,
+            compute_stats=compute_stats,
+            compute_hash=compute_hash,
+            compute_sha256=compute_sha256,
+        )
+
+    @classmethod
+    def warm_up(cls) -> None:
+        # Optional accelerated kernels are only used once warmed, so call this at startup. Without numba
+        # there is nothing to warm, and numpy/Pillow/cv2 stay unloaded until the first image arrives.
+        if importlib.util.find_spec("numba") is None:
+            return
+
+        from agent.services import _imaging
+
+        _imaging.warm_up()
+
+    @classmethod
+    def clear_result_cache(cls) -> None:
+        _result_cache.clear()
+
     @classmethod
     def save_image(cls, image: Image.Image, output_path: str | Path, format: str | None = None) -> bool:
         try:
@@ -168,11 +442,30 @@ class MultiModalProcessor:
 
     @classmethod
     def resize_image(cls, image: Image.Image, max_size: tuple) -> Image.Image:
+        from PIL import Image
+
         image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        # The encoded source no longer matches the resized pixels
+        image.__dict__.pop(_SOURCE_BYTES_ATTR, None)
         return image
 
     @classmethod
     def convert_image_format(cls, image: Image.Image, target_format: str) -> bytes:
+        from PIL import Image
+
+        # Re-encoding into the format the image was decoded from is wasted work; reuse the source bytes.
+        # Sources carrying metadata are still re-encoded so EXIF/GPS tags are stripped as before.
+        source: tuple[bytes, tuple[int, int], str] | None = getattr(image, _SOURCE_BYTES_ATTR, None)
+        if (
+            source is not None
+            and (image.format or "").upper() == target_format.upper()
+            and source[1] == image.size
+            and source[2] == image.mode
+            and _is_unmodified(image, source[0])
+            and not _has_metadata(image)
+        ):
+            return source[0]
+
         output = io.BytesIO()
 
         # Handle format conversions
@@ -189,37 +482,41 @@ class MultiModalProcessor:
     def encode_image_base64(cls, image: Image.Image, format: str = "PNG") -> str:
         buffer = io.BytesIO()
         image.save(buffer, format=format)
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return _b64encode_str(buffer.getvalue())
 
     @classmethod
-    def process_document(cls, doc_data: str, mime_type: str) -> dict[str, Any]:
+    def process_document(cls, doc_data: str, mime_type: str, compute_sha256: bool = False) -> dict[str, Any]:
         try:
-            # Decode base64 data
-            doc_bytes = base64.b64decode(doc_data)
+            # Decode base64 data and hash it for deduplication
+            doc_bytes, doc_hash, hash_algo = _decode_and_hash(doc_data)
 
             # Extract basic metadata
             metadata = {
                 "mime_type": mime_type,
                 "size_bytes": len(doc_bytes),
                 "size_mb": len(doc_bytes) / (1024 * 1024),
-                "hash": hashlib.sha256(doc_bytes).hexdigest(),
+                "hash": doc_hash,
+                "hash_algo": hash_algo,
             }
 
+            if compute_sha256:
+                _add_sha256(metadata, doc_bytes)
+
             # Process based on document type
             if mime_type == "text/plain":
                 # Decode text content
                 try:
                     content = doc_bytes.decode("utf-8")
                     metadata["content"] = content
-                    metadata["line_count"] = len(content.split("\n"))
-                    metadata["word_count"] = len(content.split())
+                    metadata["line_count"] = content.count("\n") + 1
+                    metadata["word_count"] = _count_words(content)
                 except UnicodeDecodeError:
                     metadata["error"] = "Failed to decode text content"
 
             elif mime_type == "application/json":
                 # Parse JSON content
                 try:
-                    content = json.loads(doc_bytes.decode("utf-8"))
+                    content = _json_loads(doc_bytes)
                     metadata["content"] = content
                     metadata["keys"] = list(content.keys()) if isinstance(content, dict) else None
                 except (json.JSONDecodeError, UnicodeDecodeError) as e:
@@ -233,14 +530,19 @@ class MultiModalProcessor:
 
     @classmethod
     def validate_file_size(cls, data: str, file_type: str = "default") -> bool:
-        # Calculate size in MB
-        size_bytes = len(base64.b64decode(data))
-        size_mb = size_bytes / (1024 * 1024)
-
         # Get limit for file type
         limit_mb = cls.MAX_FILE_SIZES.get(file_type, cls.MAX_FILE_SIZES["default"])
+        limit_bytes = limit_mb * 1024 * 1024
 
-        return size_mb <= limit_mb
+        # Derive the decoded size without decoding; malformed input is left to the decode that follows
+        encoded_length = len(data)
+        if "\n" in data:
+            # Line breaks (MIME-style wrapping) are not payload; the decoder skips them too
+            encoded_length -= data.count("\n") + data.count("\r")
+        padding = data[-6:].rstrip("\r\n")[-2:].count("=")
+        size_bytes = (encoded_length * 3) // 4 - padding
+
+        return size_bytes <= limit_bytes
 
     @classmethod
     def create_data_part(cls, file_path: str | Path, name: str | None = None) -> DataPart | None:
@@ -256,9 +558,13 @@ class MultiModalProcessor:
             if not mime_type:
                 mime_type = "application/octet-stream"
 
-            # Read and encode file
+            # Read and encode file; map it instead of materialising a bytes copy (mmap rejects empty files)
             with open(file_path, "rb") as f:
-                data = base64.b64encode(f.read()).decode("utf-8")
+                if file_path.stat().st_size == 0:
+                    data = _b64encode_str(f.read())
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        data = _b64encode_str(mapped)
 
             # Create DataPart
             return DataPart(name=name or file_path.name, mimeType=mime_type, data=data)
@@ -298,33 +604,42 @@ class MultiModalProcessor:
     @classmethod
     def extract_all_content(cls, parts: list[Part]) -> dict[str, list[Any]]:
         content = {"text": [], "images": [], "documents": [], "other": []}
+        mime_buckets = cls._MIME_BUCKETS
+
+        # Bind appenders once rather than looking them up per part
+        append_text = content["text"].append
+        append_other = content["other"].append
+        file_buckets = {
+            "images": content["images"].append,
+            "documents": content["documents"].append,
+            "other": append_other,
+        }
 
         for part in parts:
             if hasattr(part, "root"):
-                if part.root.kind == "text":
-                    content["text"].append(part.root.text)
-
-                elif part.root.kind == "file":
-                    file_part = part.root
+                root = part.root
+                kind = root.kind
+                if kind == "text":
+                    append_text(root.text)
+
+                elif kind == "file":
+                    file_obj = root.file
+                    mime_type = file_obj.mimeType
                     file_info = {
-                        "name": file_part.file.name or "file",
-                        "mime_type": file_part.file.mimeType,
-                        "data": file_part.file.bytes if hasattr(file_part.file, "bytes") else None,
-                        "uri": file_part.file.uri if hasattr(file_part.file, "uri") else None,
+                        "name": file_obj.name or "file",
+                        "mime_type": mime_type,
+                        "data": file_obj.bytes if hasattr(file_obj, "bytes") else None,
+                        "uri": file_obj.uri if hasattr(file_obj, "uri") else None,
                     }
 
-                    if file_part.file.mimeType and file_part.file.mimeType.startswith("image/"):
-                        content["images"].append(file_info)
-                    elif file_part.file.mimeType and file_part.file.mimeType in cls.DOCUMENT_FORMATS:
-                        content["documents"].append(file_info)
-                    else:
-                        content["other"].append(file_info)
+                    bucket = mime_buckets.get(mime_type)
+                    if bucket is None:
+                        # Unlisted image subtypes are still images; anything else is "other"
+                        bucket = "images" if mime_type and mime_type.startswith("image/") else "other"
+                    file_buckets[bucket](file_info)
 
-                elif part.root.kind == "data":
-                    data_part = part.root
-                    content["other"].append(
-                        {"name": "structured_data", "mime_type": "application/json", "data": data_part.data}
-                    )
+                elif kind == "data":
+                    append_other({"name": "structured_data", "mime_type": "application/json", "data": root.data})
 
         return content
 
@@ -346,6 +661,8 @@ class MultiModalService:
         )
 
     async def initialize(self) -> None:
+        # JIT-compile the optional image kernel here rather than on the first request
+        await asyncio.to_thread(MultiModalProcessor.warm_up)
         logger.info(f"Multi-modal service {self.name} initialized")
         self._initialized = True
 
@@ -378,7 +695,14 @@ class MultiModalService:
     def extract_all_content(self, parts: list[Part]) -> dict[str, list[Any]]:
         return MultiModalProcessor.extract_all_content(parts)
 
-    def process_image(self, image_data: str, mime_type: str) -> dict[str, Any]:
+    def process_image(
+        self,
+        image_data: str,
+        mime_type: str,
+        compute_stats: bool = True,
+        compute_hash: bool = True,
+        compute_sha256: bool = False,
+    ) -> dict[str, Any]:
         # Validate size if configured
         if not MultiModalProcessor.validate_file_size(image_data, "image"):
             return {"success": False, "error": f"Image exceeds maximum size of {self.max_image_size_mb}MB"}
@@ -387,9 +711,15 @@ class MultiModalService:
         if mime_type not in self.supported_image_formats:
             return {"success": False, "error": f"Unsupported image format: {mime_type}"}
 
-        return MultiModalProcessor.process_image(image_data, mime_type)
+        return MultiModalProcessor.process_image(
+            image_data,
+            mime_type,
+            compute_stats=compute_stats,
+            compute_hash=compute_hash,
+            compute_sha256=compute_sha256,
+        )
 
-    def process_document(self, doc_data: str, mime_type: str) -> dict[str, Any]:
+    def process_document(self, doc_data: str, mime_type: str, compute_sha256: bool = False) -> dict[str, Any]:
         # Validate size if configured
         if not MultiModalProcessor.validate_file_size(doc_data, "document"):
             return {"success": False, "error": f"Document exceeds maximum size of {self.max_document_size_mb}MB"}
@@ -398,7 +728,7 @@ class MultiModalService:
         if mime_type not in self.supported_document_formats:
             return {"success": False, "error": f"Unsupported document format: {mime_type}"}
 
-        return MultiModalProcessor.process_document(doc_data, mime_type)
+        return MultiModalProcessor.process_document(doc_data, mime_type, compute_sha256=compute_sha256)
 
     def resize_image(self, image: Image.Image, max_size: tuple) -> Image.Image:
         return MultiModalProcessor.resize_image(image, max_size)
@@ -1,7 +1,8 @@
+import asyncio
+from dataclasses import dataclass, field
 from typing import Any
 
 import structlog
-from pydantic import BaseModel, Field
 
 from agent.config import Config
 from agent.config.model import AgentConfig, ServiceConfig
@@ -14,25 +15,28 @@ from agent.utils.helpers import load_callable
 
 logger = structlog.get_logger(__name__)
 
+# Upper bound for a single service health check, so one stuck backend can't stall health_check_all
+HEALTH_CHECK_TIMEOUT = 5.0
+
 
 class ServiceError(Exception):
     pass
 
 
-class Service(BaseModel):
-    model_config = {"arbitrary_types_allowed": True}
+@dataclass(slots=True)
+class Service:
+    name: str
+    config: dict[str, Any] = field(default_factory=dict)
+    initialized: bool = field(default=False, repr=False)
 
-    name: str = Field(..., description="Service name")
-    config: dict[str, Any] = Field(default_factory=dict, description="Service configuration")
-    initialized: bool = Field(default=False, exclude=True, description="Initialization status", alias="_initialized")
+    # Backward compatibility alias for the previous "_initialized" field alias
+    @property
+    def _initialized(self) -> bool:
+        return self.initialized
 
-    def __init__(self, name: str = None, config: dict[str, Any] = None, **data):
-        if name is not None and config is not None:
-            # Old-style positional arguments
-            super().__init__(name=name, config=config, **data)
-        else:
-            # New-style keyword arguments
-            super().__init__(**data)
+    @_initialized.setter
+    def _initialized(self, value: bool) -> None:
+        self.initialized = value
 
     async def initialize(self) -> None:
         raise NotImplementedError
@@ -48,21 +52,20 @@ class Service(BaseModel):
         return self.initialized
 
 
+@dataclass(slots=True)
 class CacheService(Service):
     """
     Service for caching (Valkey, Memcached, etc.).
     """
 
-    url: str = Field(default="valkey://localhost:6379", description="Cache service URL")
-    ttl: int = Field(default=3600, description="Default TTL in seconds")
-    client: Any = Field(default=None, exclude=True, description="Cache client instance")
+    url: str = field(default="valkey://localhost:6379", init=False)
+    ttl: int = field(default=3600, init=False)
+    client: Any = field(default=None, init=False, repr=False)
 
-    def __init__(self, name: str, config: dict[str, Any], **data):
+    def __post_init__(self) -> None:
         # Extract cache-specific config with defaults
-        url = config.get("url", "valkey://localhost:6379")
-        ttl = config.get("ttl", 3600)
-
-        super().__init__(name=name, config=config, url=url, ttl=ttl, **data)
+        self.url = self.config.get("url", "valkey://localhost:6379")
+        self.ttl = self.config.get("ttl", 3600)
 
     async def initialize(self) -> None:
         logger.info(f"Cache service {self.name} initialized with URL: {self.url}")
@@ -101,22 +104,19 @@ class CacheService(Service):
         logger.info(f"Cache DELETE: {key}")
 
 
+@dataclass(slots=True)
 class WebAPIService(Service):
-    base_url: str = Field(default="", description="Base URL for API")
-    api_key: str = Field(default="", description="API key for authentication")
-    headers: dict[str, str] = Field(default_factory=dict, description="HTTP headers")
-    timeout: float = Field(default=30.0, description="Request timeout in seconds")
+    base_url: str = field(default="", init=False)
+    api_key: str = field(default="", init=False, repr=False)
+    headers: dict[str, str] = field(default_factory=dict, init=False)
+    timeout: float = field(default=30.0, init=False)
 
-    def __init__(self, name: str, config: dict[str, Any], **data):
+    def __post_init__(self) -> None:
         # Extract web API specific config with defaults
-        base_url = config.get("base_url", "")
-        api_key = config.get("api_key", "")
-        headers = config.get("headers", {})
-        timeout = config.get("timeout", 30.0)
-
-        super().__init__(
-            name=name, config=config, base_url=base_url, api_key=api_key, headers=headers, timeout=timeout, **data
-        )
+        self.base_url = self.config.get("base_url", "")
+        self.api_key = self.config.get("api_key", "")
+        self.headers = self.config.get("headers", {})
+        self.timeout = self.config.get("timeout", 30.0)
 
     async def initialize(self) -> None:
         logger.info(f"Web API service {self.name} initialized with base URL: {self.base_url}")
@@ -152,35 +152,43 @@ class WebAPIService(Service):
         return {"result": "api_response"}
 
 
-class ServiceRegistry(BaseModel):
+async def _health_check_with_timeout(service: Service) -> dict[str, Any]:
+    # Only the deadline set here counts as a timeout; a TimeoutError raised by the check itself propagates as is
+    try:
+        async with asyncio.timeout(HEALTH_CHECK_TIMEOUT) as deadline:
+            return await service.health_check()
+    except TimeoutError:
+        if deadline.expired():
+            return {"status": "error", "error": f"Health check timed out after {HEALTH_CHECK_TIMEOUT}s"}
+        raise
+
+
+@dataclass(slots=True, init=False)
+class ServiceRegistry:
     """
     Registry for managing services with LLM provider support.
     """
 
-    model_config = {"arbitrary_types_allowed": True}  # Allow non-serializable types
+    config: AgentConfig
+    services: dict[str, str] = field(default_factory=dict)
+    service_instances: dict[str, Service] = field(default_factory=dict, repr=False)
+    llm_providers: dict[str, Any] = field(default_factory=dict, repr=False)
+    service_types: dict[str, Any] = field(default_factory=dict, repr=False)
+    factories: dict[str, Any] = field(default_factory=dict, repr=False)
 
-    config: AgentConfig = Field(..., description="Agent configuration")
-    services: dict[str, str] = Field(default_factory=dict, description="Registered services")
-    service_instances: dict[str, Service] = Field(
-        default_factory=dict, exclude=True, description="Internal service instances"
-    )
-    llm_providers: dict[str, Any] = Field(default_factory=dict, exclude=True, description="LLM provider classes")
-    service_types: dict[str, Any] = Field(default_factory=dict, exclude=True, description="Service type mappings")
-    factories: dict[str, Any] = Field(default_factory=dict, exclude=True, description="Service factories")
-
-    def __init__(self, config: AgentConfig | None = None, **data):
+    def __init__(self, config: AgentConfig | None = None):
         raw = Config.model_dump() if config is None else config.model_dump()
         # Filter out orchestrator field which only exists in Settings, not AgentConfig
         raw.pop("orchestrator", None)
         # Handle ai_provider conversion from Settings (which can be None) to AgentConfig (which expects dict)
         if raw.get("ai_provider") is None:
             raw["ai_provider"] = {}
-        agent_config = AgentConfig.model_validate(raw)
-
-        # Initialize Pydantic fields
-        super().__init__(config=agent_config, **data)
+        # Config is validated once here; registry lookups afterwards are plain attribute/dict access
+        self.config = AgentConfig.model_validate(raw)
+        self.services = {}
+        self.service_instances = {}
 
-        # Set up internal mappings after Pydantic initialization
+        # Set up internal mappings
         self.llm_providers = {
             "openai": OpenAIProvider,
             "anthropic": AnthropicProvider,
@@ -239,7 +247,7 @@ class ServiceRegistry(BaseModel):
             # call the factory with the name + its own config dict
             instance = factory(name=name, config=svc_conf.settings or {})
             self.service_instances[name] = instance
-            # Update Pydantic field with string representation
+            # Record string representation of the service
             self.services[name] = str(instance)
 
     def _create_llm_service(self, name: str, config: dict[str, Any]) -> Service:
@@ -294,7 +302,7 @@ class ServiceRegistry(BaseModel):
                 await service.initialize()
 
             self.service_instances[name] = service
-            # Update Pydantic field with string representation
+            # Record string representation of the service
             self.services[name] = str(service)
             logger.info(f"Successfully registered service {name} of type {service_type} as {type(service)}")
         except Exception as e:
@@ -349,12 +357,19 @@ class ServiceRegistry(BaseModel):
         return list(self.service_instances.keys())
 
     async def health_check_all(self) -> dict[str, dict[str, Any]]:
+        # Run checks concurrently so total latency is the slowest check, not the sum
+        names = list(self.service_instances)
+        outcomes = await asyncio.gather(
+            *(_health_check_with_timeout(self.service_instances[name]) for name in names),
+            return_exceptions=True,
+        )
+
         results = {}
-        for name, service in self.service_instances.items():
-            try:
-                results[name] = await service.health_check()
-            except Exception as e:
-                results[name] = {"status": "error", "error": str(e)}
+        for name, outcome in zip(names, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                results[name] = {"status": "error", "error": str(outcome)}
+            else:
+                results[name] = outcome
         return results
 
 
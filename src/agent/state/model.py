@@ -7,18 +7,30 @@ variables, and backend configuration.
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import re
+import time
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Generic, Literal, TypeVar
+from typing import Annotated, Any, Generic, Literal, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, computed_field, field_validator
 
 from ..types import TTL, FilePath, SessionId, Timestamp, UserId
 from ..types import ConfigDict as ConfigDictType
 
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 # Generic type for state variables
 T = TypeVar("T")
 
+# Allow alphanumeric, dots, hyphens, underscores
+_KEY_RE = re.compile(r"^[a-zA-Z0-9._-]+$")
+
 
 class StateVariableType(str, Enum):
     STRING = "string"
@@ -31,6 +43,18 @@ class StateVariableType(str, Enum):
     BINARY = "binary"
 
 
+# Exact-type lookup for _determine_type; subclasses fall through to the isinstance checks
+_TYPE_MAP: dict[type, StateVariableType] = {
+    str: StateVariableType.STRING,
+    bool: StateVariableType.BOOLEAN,
+    int: StateVariableType.INTEGER,
+    float: StateVariableType.FLOAT,
+    list: StateVariableType.LIST,
+    dict: StateVariableType.DICT,
+    bytes: StateVariableType.BINARY,
+}
+
+
 class StateVariable(BaseModel, Generic[T]):
     key: str = Field(..., description="Variable key")
     value: T = Field(..., description="Variable value")
@@ -50,10 +74,7 @@ class StateVariable(BaseModel, Generic[T]):
     def validate_key(cls, v: str) -> str:
         if not v or len(v) > 256:
             raise ValueError("Key must be 1-256 characters")
-        # Allow alphanumeric, dots, hyphens, underscores
-        import re
-
-        if not re.match(r"^[a-zA-Z0-9._-]+$", v):
+        if not _KEY_RE.match(v):
             raise ValueError("Key can only contain alphanumeric characters, dots, hyphens, and underscores")
         return v
 
@@ -64,15 +85,31 @@ class StateVariable(BaseModel, Generic[T]):
             raise ValueError("TTL must be positive")
         return v
 
+    # (updated_at, ttl, expiry epoch) the expiry was computed from
+    _expiry: tuple[datetime, int, float] | None = PrivateAttr(None)
+
+    @property
+    def expires_at_ts(self) -> float | None:
+        ttl = self.ttl
+        if not ttl:
+            return None
+        cached = self._expiry
+        # Recompute only when updated_at or ttl were replaced since the last call
+        if cached is None or cached[0] is not self.updated_at or cached[1] != ttl:
+            updated_at = self.updated_at
+            if updated_at.tzinfo is None:
+                # utcnow() timestamps are naive UTC
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            cached = self._expiry = (self.updated_at, ttl, updated_at.timestamp() + ttl)
+        return cached[2]
+
     @property
     def is_expired(self) -> bool:
-        if not self.ttl:
-            return False
-        expires_at = self.updated_at + timedelta(seconds=self.ttl)
-        return datetime.utcnow() > expires_at
+        expires_at = self.expires_at_ts
+        return expires_at is not None and time.time() > expires_at
 
-    def touch(self) -> None:
-        self.updated_at = datetime.utcnow()
+    def touch(self, now: datetime | None = None) -> None:
+        self.updated_at = now or datetime.utcnow()
         self.version += 1
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -87,9 +124,9 @@ class ConversationRole(str, Enum):
 
 
 class ConversationMessage(BaseModel):
-    id: str = Field(..., description="Message identifier")
+    id: str = Field(..., min_length=1, max_length=128, description="Message identifier")
     role: ConversationRole = Field(..., description="Message role")
-    content: str = Field(..., description="Message content")
+    content: str = Field(..., max_length=1_000_000, description="Message content (max 1MB)")
     timestamp: Timestamp = Field(default_factory=datetime.utcnow, description="Message timestamp")
 
     # Message metadata
@@ -105,20 +142,6 @@ class ConversationMessage(BaseModel):
     reply_to: str | None = Field(None, description="ID of message this replies to")
     thread_id: str | None = Field(None, description="Thread identifier")
 
-    @field_validator("content")
-    @classmethod
-    def validate_content(cls, v: str) -> str:
-        if len(v) > 1_000_000:  # 1MB limit
-            raise ValueError("Message content too large (max 1MB)")
-        return v
-
-    @field_validator("id")
-    @classmethod
-    def validate_id(cls, v: str) -> str:
-        if not v or len(v) > 128:
-            raise ValueError("Message ID must be 1-128 characters")
-        return v
-
 
 class ConversationSummary(BaseModel):
     total_messages: int = Field(..., description="Total number of messages")
@@ -132,7 +155,7 @@ class ConversationSummary(BaseModel):
 
 
 class ConversationState(BaseModel):
-    context_id: str = Field(..., description="Conversation context identifier")
+    context_id: str = Field(..., min_length=1, max_length=128, description="Conversation context identifier")
     user_id: UserId | None = Field(None, description="Associated user")
     session_id: SessionId | None = Field(None, description="Session identifier")
 
@@ -144,11 +167,12 @@ class ConversationState(BaseModel):
     # State data
     variables: dict[str, StateVariable] = Field(default_factory=dict, description="State variables")
     metadata: dict[str, str] = Field(default_factory=dict, description="Conversation metadata")
+    # Use add_message; after editing `history` or its messages directly, call recount()
     history: list[ConversationMessage] = Field(default_factory=list, description="Message history")
 
     # Configuration
-    max_history_size: int = Field(100, description="Maximum history size")
-    max_variable_count: int = Field(1000, description="Maximum variable count")
+    max_history_size: int = Field(100, gt=0, le=10000, description="Maximum history size")
+    max_variable_count: int = Field(1000, gt=0, le=10000, description="Maximum variable count")
     auto_summarize: bool = Field(True, description="Auto-summarize old messages")
 
     # Summary and archival
@@ -160,67 +184,110 @@ class ConversationState(BaseModel):
     category: str | None = Field(None, description="Conversation category")
     priority: int = Field(0, description="Conversation priority")
 
-    @field_validator("context_id")
-    @classmethod
-    def validate_context_id(cls, v: str) -> str:
-        if not v or len(v) > 128:
-            raise ValueError("Context ID must be 1-128 characters")
-        return v
-
-    @field_validator("max_history_size", "max_variable_count")
-    @classmethod
-    def validate_limits(cls, v: int) -> int:
-        if v <= 0:
-            raise ValueError("Limits must be positive")
-        if v > 10000:
-            raise ValueError("Limits too large (max 10000)")
-        return v
+    # Message id -> position in `history` plus _index_offset; hits are checked against `history` before use
+    _id_index: dict[str, int] = PrivateAttr(default_factory=dict)
+    # Messages trimmed from the front of `history` since the index was built
+    _index_offset: int = PrivateAttr(0)
+    # len(history) the index describes; a different length means `history` was edited directly
+    _indexed_length: int = PrivateAttr(0)
+    # Running totals over `history`, kept in step by add_message and trimming
+    _user_count: int = PrivateAttr(0)
+    _agent_count: int = PrivateAttr(0)
+    _token_total: int = PrivateAttr(0)
+
+    def model_post_init(self, __context: Any) -> None:
+        self.recount()
+
+    def recount(self) -> None:
+        # Rebuild the running totals and id index from `history` after it was edited directly
+        self._user_count, self._agent_count, self._token_total = _tally_messages(self.history)
+        self._reindex()
 
     def add_message(self, message: ConversationMessage) -> None:
+        self._id_index[message.id] = self._index_offset + len(self.history)
         self.history.append(message)
-        self.last_activity = datetime.utcnow()
-        self.updated_at = self.last_activity
+        self.last_activity = self.updated_at = datetime.utcnow()
+
+        if message.role == ConversationRole.USER:
+            self._user_count += 1
+        elif message.role == ConversationRole.AGENT:
+            self._agent_count += 1
+        if message.tokens:
+            self._token_total += message.tokens
 
         # Enforce history size limit
         if len(self.history) > self.max_history_size:
             if self.auto_summarize:
                 self._archive_old_messages()
             else:
-                # Remove oldest messages
-                removed = self.history[: -self.max_history_size]
-                self.history = self.history[-self.max_history_size :]
-                self.archived_messages += len(removed)
-
-    def set_variable(self, key: str, value: Any, ttl: TTL | None = None) -> None:
+                # Remove oldest messages in place; usually only one has overflowed
+                overflow = len(self.history) - self.max_history_size
+                removed = self.history[:overflow]
+                del self.history[:overflow]
+                self.archived_messages += overflow
+                self._forget_messages(removed)
+
+        self._indexed_length = len(self.history)
+
+    def get_message(self, message_id: str) -> ConversationMessage | None:
+        history = self.history
+        position = self._id_index.get(message_id)
+        if position is not None:
+            position -= self._index_offset
+            if 0 <= position < len(history) and history[position].id == message_id:
+                return history[position]
+        elif len(history) == self._indexed_length:
+            # Unknown id and unchanged history, e.g. the reply_to of an archived message
+            return None
+
+        # `history` was edited directly; rebuild the index from it
+        self._reindex()
+        position = self._id_index.get(message_id)
+        return history[position] if position is not None else None
+
+    def _reindex(self) -> None:
+        self._id_index = {msg.id: i for i, msg in enumerate(self.history)}
+        self._index_offset = 0
+        self._indexed_length = len(self.history)
+
+    def set_variable(self, key: str, value: Any, ttl: TTL | None = None, validate: bool = False) -> None:
         if len(self.variables) >= self.max_variable_count and key not in self.variables:
             raise ValueError(f"Maximum variable count ({self.max_variable_count}) exceeded")
 
         # Determine type
         var_type = self._determine_type(value)
+        now = datetime.utcnow()
 
         if key in self.variables:
             # Update existing variable
             var = self.variables[key]
             var.value = value
-            var.touch()
+            var.touch(now)
             if ttl is not None:
                 var.ttl = ttl
         else:
-            # Create new variable
-            self.variables[key] = StateVariable(
-                key=key,
-                value=value,
-                type_name=var_type,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-                ttl=ttl,
-                version=1,
-                description=None,
-                tags=[],
-                metadata={},
-            )
+            # Create new variable. Every field is built here, so only the key and TTL
+            # checks need to run unless the caller asks for full model validation.
+            fields = {
+                "key": key,
+                "value": value,
+                "type_name": var_type,
+                "created_at": now,
+                "updated_at": now,
+                "ttl": ttl,
+                "version": 1,
+                "description": None,
+                "tags": [],
+                "metadata": {},
+            }
+            if validate:
+                self.variables[key] = StateVariable(**fields)
+            else:
+                StateVariable.validate_key(key)
+                StateVariable.validate_ttl(ttl)
+                self.variables[key] = StateVariable.model_construct(**fields)
 
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now
 
     def get_variable(self, key: str, default: Any = None) -> Any:
         if key not in self.variables:
@@ -241,7 +308,12 @@ class ConversationState(BaseModel):
         return False
 
     def cleanup_expired_variables(self) -> int:
-        expired_keys = [key for key, var in self.variables.items() if var.is_expired]
+        now = time.time()
+        expired_keys = []
+        for key, var in self.variables.items():
+            expires_at = var.expires_at_ts
+            if expires_at is not None and now > expires_at:
+                expired_keys.append(key)
 
         for key in expired_keys:
             del self.variables[key]
@@ -252,9 +324,7 @@ class ConversationState(BaseModel):
         return len(expired_keys)
 
     def get_summary_stats(self) -> ConversationSummary:
-        user_msgs = sum(1 for msg in self.history if msg.role == ConversationRole.USER)
-        agent_msgs = sum(1 for msg in self.history if msg.role == ConversationRole.AGENT)
-        total_tokens = sum(msg.tokens or 0 for msg in self.history if msg.tokens)
+        user_msgs, agent_msgs, total_tokens = self._user_count, self._agent_count, self._token_total
 
         first_msg = self.history[0] if self.history else None
         last_msg = self.history[-1] if self.history else None
@@ -271,6 +341,9 @@ class ConversationState(BaseModel):
         )
 
     def _determine_type(self, value: Any) -> StateVariableType:
+        var_type = _TYPE_MAP.get(type(value))
+        if var_type is not None:
+            return var_type
         if isinstance(value, str):
             return StateVariableType.STRING
         elif isinstance(value, bool):
@@ -292,12 +365,13 @@ class ConversationState(BaseModel):
         # Keep recent messages, archive the rest
         keep_count = self.max_history_size // 2
         to_archive = self.history[:-keep_count]
-        self.history = self.history[-keep_count:]
+        del self.history[:-keep_count]
         self.archived_messages += len(to_archive)
+        user_archived, agent_archived, _ = self._forget_messages(to_archive)
 
         # Update summary
         if not self.summary:
-            self.summary = ConversationSummary(
+            self.summary = ConversationSummary.model_construct(
                 total_messages=0,
                 user_messages=0,
                 agent_messages=0,
@@ -310,8 +384,37 @@ class ConversationState(BaseModel):
 
         # Update counts
         self.summary.total_messages += len(to_archive)
-        self.summary.user_messages += sum(1 for msg in to_archive if msg.role == ConversationRole.USER)
-        self.summary.agent_messages += sum(1 for msg in to_archive if msg.role == ConversationRole.AGENT)
+        self.summary.user_messages += user_archived
+        self.summary.agent_messages += agent_archived
+
+    def _forget_messages(self, messages: list[ConversationMessage]) -> tuple[int, int, int]:
+        # `messages` were trimmed from the front, shifting every stored position
+        self._index_offset += len(messages)
+        index = self._id_index
+        for msg in messages:
+            # A later message may reuse the id; only drop entries that pointed at the trimmed range
+            position = index.get(msg.id)
+            if position is not None and position < self._index_offset:
+                del index[msg.id]
+
+        counts = _tally_messages(messages)
+        self._user_count -= counts[0]
+        self._agent_count -= counts[1]
+        self._token_total -= counts[2]
+        return counts
+
+
+def _tally_messages(messages: list[ConversationMessage]) -> tuple[int, int, int]:
+    # Single pass returning (user messages, agent messages, total tokens)
+    user = agent = tokens = 0
+    for msg in messages:
+        if msg.role == ConversationRole.USER:
+            user += 1
+        elif msg.role == ConversationRole.AGENT:
+            agent += 1
+        if msg.tokens:
+            tokens += msg.tokens
+    return user, agent, tokens
 
 
 class StateBackendType(str, Enum):
@@ -325,14 +428,14 @@ class StateBackendConfig(BaseModel):
     type: StateBackendType = Field(..., description="Backend type")
 
     # Common settings
-    ttl: TTL = Field(3600, description="Default TTL in seconds")
-    max_size: int = Field(10000, description="Maximum entries")
+    ttl: TTL = Field(3600, gt=0, description="Default TTL in seconds")
+    max_size: int = Field(10000, gt=0, description="Maximum entries")
     compression: bool = Field(False, description="Enable compression")
 
     # Connection settings
     connection_string: str | None = Field(None, description="Connection string")
     host: str | None = Field(None, description="Host address")
-    port: int | None = Field(None, description="Port number")
+    port: Annotated[int, Field(ge=1, le=65535)] | None = Field(None, description="Port number")
     database: str | None = Field(None, description="Database name")
 
     # Authentication
@@ -353,20 +456,6 @@ class StateBackendConfig(BaseModel):
     connection_timeout: int = Field(30, description="Connection timeout in seconds")
     retry_attempts: int = Field(3, description="Retry attempts")
 
-    @field_validator("ttl", "max_size")
-    @classmethod
-    def validate_positive_values(cls, v: int) -> int:
-        if v <= 0:
-            raise ValueError("Value must be positive")
-        return v
-
-    @field_validator("port")
-    @classmethod
-    def validate_port(cls, v: int | None) -> int | None:
-        if v is not None and not (1 <= v <= 65535):
-            raise ValueError("Port must be between 1 and 65535")
-        return v
-
     @computed_field  # Modern Pydantic v2 computed property
     @property
     def is_memory_backend(self) -> bool:
@@ -459,6 +548,8 @@ class StateOperation(BaseModel):
     user_id: UserId | None = Field(None, description="User who performed operation")
     metadata: dict[str, str] = Field(default_factory=dict, description="Additional metadata")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class StateMetrics(BaseModel):
     # Counts
@@ -482,6 +573,8 @@ class StateMetrics(BaseModel):
     measurement_window: timedelta = Field(..., description="Measurement time window")
     measured_at: Timestamp = Field(default_factory=datetime.utcnow, description="Measurement time")
 
+    model_config = ConfigDict(frozen=True)
+
 
 class StateConfig(BaseModel):
     enabled: bool = Field(True, description="Enable state management")
@@ -490,8 +583,8 @@ class StateConfig(BaseModel):
     backend: StateBackendConfig = Field(..., description="Storage backend configuration")
 
     # Default limits
-    default_max_history: int = Field(100, description="Default max history size")
-    default_max_variables: int = Field(1000, description="Default max variables")
+    default_max_history: int = Field(100, gt=0, description="Default max history size")
+    default_max_variables: int = Field(1000, gt=0, description="Default max variables")
     default_ttl: TTL = Field(3600, description="Default variable TTL")
 
     # Cleanup configuration
@@ -501,19 +594,48 @@ class StateConfig(BaseModel):
 
     # Performance settings
     cache_enabled: bool = Field(True, description="Enable in-memory caching")
-    cache_size: int = Field(1000, description="Cache size")
+    cache_size: int = Field(1000, gt=0, description="Cache size")
     cache_ttl: TTL = Field(300, description="Cache TTL")
 
     # Monitoring
     metrics_enabled: bool = Field(True, description="Enable metrics collection")
     operation_logging: bool = Field(False, description="Log all operations")
 
-    @field_validator("default_max_history", "default_max_variables", "cache_size")
-    @classmethod
-    def validate_positive_limits(cls, v: int) -> int:
-        if v <= 0:
-            raise ValueError("Limit must be positive")
-        return v
+
+_history_adapter = TypeAdapter(list[ConversationMessage])
+
+if MSGSPEC_AVAILABLE:
+
+    class ConversationMessageStruct(msgspec.Struct, frozen=True):
+        # Mirrors ConversationMessage field for field, including its id/content limits,
+        # so decoded messages can skip pydantic validation
+        id: Annotated[str, msgspec.Meta(min_length=1, max_length=128)]
+        role: ConversationRole
+        content: Annotated[str, msgspec.Meta(max_length=1_000_000)]
+        timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
+        metadata: dict[str, str] = {}
+        tokens: int | None = None
+        function_name: str | None = None
+        function_call: dict[str, Any] | None = None
+        tool_calls: list[dict[str, Any]] = []
+        reply_to: str | None = None
+        thread_id: str | None = None
+
+    _history_encoder = msgspec.json.Encoder()
+    _history_decoder = msgspec.json.Decoder(list[ConversationMessageStruct])
+
+
+def encode_history(state: ConversationState, fast: bool = False) -> bytes:
+    # Both codecs emit the same JSON array of message objects, so either can read the other's output
+    if fast and MSGSPEC_AVAILABLE:
+        return _history_encoder.encode([msg.__dict__ for msg in state.history])
+    return _history_adapter.dump_json(state.history)
+
+
+def decode_history(data: bytes | str, fast: bool = False) -> list[ConversationMessage]:
+    if fast and MSGSPEC_AVAILABLE:
+        return [ConversationMessage.model_construct(**msgspec.structs.asdict(s)) for s in _history_decoder.decode(data)]
+    return _history_adapter.validate_json(data)
 
 
 # Re-export key models
@@ -530,4 +652,6 @@ __all__ = [
     "StateOperationType",
     "StateMetrics",
     "StateConfig",
+    "encode_history",
+    "decode_history",
 ]
@@ -1,16 +1,18 @@
 import questionary
 
+# (title, value, checked) for each feature offered by `agentup init`
+_FEATURE_CHOICES: tuple[tuple[str, str, bool], ...] = (
+    ("Authentication Method (API Key, Bearer(JWT), OAuth2)", "auth", True),
+    ("Context-Aware Middleware (caching, retry, rate limiting)", "middleware", True),
+    ("State Management (conversation persistence)", "state_management", True),
+    ("AI Provider (ollama, openai, anthropic)", "ai_provider", False),
+    ("MCP Integration (Model Context Protocol)", "mcp", True),
+    ("Push Notifications (webhooks)", "push_notifications", False),
+    ("Development Features (filesystem plugins, debug mode)", "development", False),
+    ("Deployment (Docker, Helm Charts)", "deployment", False),
+)
+
 
 def get_feature_choices() -> list[questionary.Choice]:
-    return [
-        questionary.Choice("Authentication Method (API Key, Bearer(JWT), OAuth2)", value="auth", checked=True),
-        questionary.Choice(
-            "Context-Aware Middleware (caching, retry, rate limiting)", value="middleware", checked=True
-        ),
-        questionary.Choice("State Management (conversation persistence)", value="state_management", checked=True),
-        questionary.Choice("AI Provider (ollama, openai, anthropic)", value="ai_provider"),
-        questionary.Choice("MCP Integration (Model Context Protocol)", value="mcp", checked=True),
-        questionary.Choice("Push Notifications (webhooks)", value="push_notifications"),
-        questionary.Choice("Development Features (filesystem plugins, debug mode)", value="development"),
-        questionary.Choice("Deployment (Docker, Helm Charts)", value="deployment"),
-    ]
+    # Fresh Choice objects every call: the CLI flips `checked` on the ones it gets back
+    return [questionary.Choice(title, value=value, checked=checked) for title, value, checked in _FEATURE_CHOICES]
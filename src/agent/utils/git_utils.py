@@ -13,27 +13,23 @@ def get_git_author_info() -> dict[str, str | None]:
     author_info: dict[str, str | None] = {"name": None, "email": None}
 
     try:
-        # Get the user name
-        name_result = subprocess.run(
-            ["git", "config", "--get", "user.name"],
+        # Read user.name and user.email with one git process; --null separates each
+        # entry as "key\nvalue\0" so values containing spaces or newlines parse cleanly
+        result = subprocess.run(
+            ["git", "config", "--null", "--get-regexp", r"^user\.(name|email)$"],
             capture_output=True,
             text=True,
             check=False,
             timeout=5,
         )  # nosec
-        if name_result.returncode == 0:
-            author_info["name"] = name_result.stdout.strip() or None
-
-        # Get the user email
-        email_result = subprocess.run(
-            ["git", "config", "--get", "user.email"],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=5,
-        )  # nosec
-        if email_result.returncode == 0:
-            author_info["email"] = email_result.stdout.strip() or None
+        if result.returncode == 0:
+            for entry in result.stdout.split("\0"):
+                key, _, value = entry.partition("\n")
+                # Later entries win, matching `git config --get` for repeated keys
+                if key == "user.name":
+                    author_info["name"] = value.strip() or None
+                elif key == "user.email":
+                    author_info["email"] = value.strip() or None
 
     except (FileNotFoundError, subprocess.TimeoutExpired):
         # Handle cases where git is not installed or times out
@@ -56,8 +52,8 @@ def initialize_git_repo(project_path: Path) -> tuple[bool, str | None]:
         as long as the entry point is the CLI command and the project_path is controlled.
     """
     try:
-        subprocess.run(["git", "--version"], check=True, capture_output=True)  # nosec
-
+        # No separate `git --version` probe: a missing git binary surfaces as
+        # FileNotFoundError from `git init` just the same
         subprocess.run(["git", "init"], cwd=project_path, check=True, capture_output=True)  # nosec
 
         subprocess.run(["git", "add", "."], cwd=project_path, check=True, capture_output=True)  # nosec
@@ -0,0 +1,52 @@
+import subprocess
+from unittest.mock import patch
+
+from agent.utils.git_utils import get_git_author_info, initialize_git_repo
+
+
+class TestGetGitAuthorInfo:
+    def test_reads_name_and_email_in_one_call(self):
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="user.name\nJane  Doe\0user.email\njane@example.com\0"
+        )
+        with patch("agent.utils.git_utils.subprocess.run", return_value=completed) as mock_run:
+            info = get_git_author_info()
+
+        mock_run.assert_called_once()
+        assert info == {"name": "Jane  Doe", "email": "jane@example.com"}
+
+    def test_last_value_wins_and_missing_keys_are_none(self):
+        completed = subprocess.CompletedProcess(args=[], returncode=0, stdout="user.name\nGlobal\0user.name\nLocal\0")
+        with patch("agent.utils.git_utils.subprocess.run", return_value=completed):
+            info = get_git_author_info()
+
+        assert info == {"name": "Local", "email": None}
+
+    def test_no_config_or_no_git(self):
+        completed = subprocess.CompletedProcess(args=[], returncode=1, stdout="")
+        with patch("agent.utils.git_utils.subprocess.run", return_value=completed):
+            assert get_git_author_info() == {"name": None, "email": None}
+
+        with patch("agent.utils.git_utils.subprocess.run", side_effect=FileNotFoundError):
+            assert get_git_author_info() == {"name": None, "email": None}
+
+
+class TestInitializeGitRepo:
+    def test_runs_init_add_commit_without_version_probe(self, tmp_path):
+        with patch("agent.utils.git_utils.subprocess.run") as mock_run:
+            assert initialize_git_repo(tmp_path) == (True, None)
+
+        commands = [call.args[0][:2] for call in mock_run.call_args_list]
+        assert commands == [["git", "init"], ["git", "add"], ["git", "commit"]]
+
+    def test_missing_git(self, tmp_path):
+        with patch("agent.utils.git_utils.subprocess.run", side_effect=FileNotFoundError):
+            assert initialize_git_repo(tmp_path) == (False, "Git not found. Please install Git.")
+
+    def test_failed_command(self, tmp_path):
+        error = subprocess.CalledProcessError(128, ["git", "commit", "-m", "Initial commit"])
+        with patch("agent.utils.git_utils.subprocess.run", side_effect=[None, None, error]):
+            success, message = initialize_git_repo(tmp_path)
+
+        assert success is False
+        assert "exit code 128" in message
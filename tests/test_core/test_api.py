@@ -1,3 +1,4 @@
+import importlib
 import sys
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -322,5 +323,29 @@ class TestSSEGenerator:
         assert "Stream error" in result[1]
 
 
+class TestLazyApp:
+    def test_app_is_built_on_first_access(self, monkeypatch):
+        app_module = importlib.import_module("agent.api.app")
+        monkeypatch.setattr(app_module, "_app", None)
+        built = FastAPI()
+
+        with patch.object(app_module, "create_app", return_value=built) as mock_create:
+            assert app_module.get_app() is built
+            assert app_module.app is built
+
+        mock_create.assert_called_once()
+
+    def test_package_app_is_fastapi_after_submodule_import(self, monkeypatch):
+        # Re-import the submodule so the import system binds it onto the package again
+        monkeypatch.delitem(sys.modules, "agent.api.app")
+        app_module = importlib.import_module("agent.api.app")
+        built = FastAPI()
+
+        with patch.object(app_module, "create_app", return_value=built):
+            from agent.api import app
+
+        assert app is built
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
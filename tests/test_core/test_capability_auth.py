@@ -0,0 +1,57 @@
+import inspect
+from unittest.mock import Mock, patch
+
+import pytest
+
+from agent.capabilities.manager import _apply_auth_to_capability
+
+
+class TestApplyAuthToCapability:
+    @pytest.mark.asyncio
+    async def test_signature_is_inspected_once(self):
+        async def executor(task, context):
+            return context
+
+        context = Mock()
+        with (
+            patch("agent.security.context.get_current_auth", return_value=None),
+            patch("agent.security.context.create_capability_context", return_value=context),
+            patch("inspect.signature", wraps=inspect.signature) as mock_signature,
+        ):
+            wrapped = _apply_auth_to_capability(executor, "cap")
+            assert await wrapped(Mock()) is context
+            assert await wrapped(Mock()) is context
+
+        assert mock_signature.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_executor_gets_task_only(self):
+        async def executor(task):
+            return task
+
+        task = Mock()
+        with (
+            patch("agent.security.context.get_current_auth", return_value=None),
+            patch("agent.security.context.create_capability_context"),
+        ):
+            wrapped = _apply_auth_to_capability(executor, "cap")
+            assert await wrapped(task) is task
+
+    @pytest.mark.asyncio
+    async def test_uninspectable_executor_gets_task_only(self):
+        # Builtins like max have no signature; wrapping must not fail registration
+        assert _apply_auth_to_capability(max, "cap").__wrapped__ is max
+
+        class Executor:
+            __signature__ = "not a signature"
+
+            async def __call__(self, *args):
+                return args
+
+        task = Mock()
+        with (
+            patch("agent.security.context.get_current_auth", return_value=None),
+            patch("agent.security.context.create_capability_context"),
+        ):
+            wrapped = _apply_auth_to_capability(Executor(), "cap")
+            assert await wrapped(task) == (task,)
@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+import structlog
+
+from agent.config import logging as logging_module
+
+
+@pytest.fixture
+def fresh_logging(monkeypatch):
+    saved_config = structlog.get_config()
+    root_logger = logging.getLogger()
+    saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+    monkeypatch.setattr(logging_module, "_logging_configured", False)
+
+    yield
+
+    structlog.configure(**saved_config)
+    root_logger.handlers[:] = saved_handlers
+    root_logger.setLevel(saved_level)
+
+
+class _CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+class TestSetupLogging:
+    def test_disabled_levels_are_dropped_before_formatting(self, fresh_logging):
+        logging_module.setup_logging(log_level="INFO")
+        logger = structlog.get_logger("agentup.test_logging")
+        arg = _CountingArg()
+
+        logger.debug("debug %s", arg)
+        assert arg.formatted == 0
+
+        logger.info("info %s", arg)
+        assert arg.formatted == 1
+
+    def test_uses_stdlib_bound_logger(self, fresh_logging):
+        logging_module.setup_logging(log_level="INFO")
+
+        assert structlog.get_config()["wrapper_class"] is structlog.stdlib.BoundLogger
+        assert structlog.get_config()["processors"][0] is structlog.stdlib.filter_by_level
@@ -0,0 +1,388 @@
+import base64
+import binascii
+import hashlib
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from agent.services import _imaging, multimodal
+from agent.services.multimodal import MultiModalProcessor
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    MultiModalProcessor.clear_result_cache()
+    yield
+    MultiModalProcessor.clear_result_cache()
+
+
+def _file_part(name: str, mime_type: str | None) -> SimpleNamespace:
+    file = SimpleNamespace(name=name, mimeType=mime_type, bytes="ZGF0YQ==", uri=None)
+    return SimpleNamespace(root=SimpleNamespace(kind="file", file=file))
+
+
+def _encode_image(image: Image.Image, format: str = "PNG") -> str:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+class TestProcessImage:
+    def test_process_color_image(self):
+        image_data = _encode_image(Image.new("RGB", (4, 2), (10, 20, 30)))
+
+        result = MultiModalProcessor.process_image(image_data, "image/png")
+
+        assert result["success"] is True
+        metadata = result["metadata"]
+        assert metadata["format"] == "PNG"
+        assert metadata["size"] == (4, 2)
+        assert metadata["shape"] == (2, 4, 3)
+        assert metadata["channel_means"] == [10.0, 20.0, 30.0]
+        assert metadata["mean_brightness"] == 20.0
+        assert metadata["hash_algo"] in ("xxh3_128", "sha256")
+        assert "sha256" not in metadata
+
+    def test_process_grayscale_image(self):
+        image_data = _encode_image(Image.new("L", (3, 3), 128))
+
+        result = MultiModalProcessor.process_image(image_data, "image/png")
+
+        assert result["success"] is True
+        assert result["metadata"]["mean_brightness"] == 128.0
+        assert result["metadata"]["std_brightness"] == 0.0
+
+    def test_statistics_match_reference(self):
+        rng = np.random.default_rng(0)
+        color = rng.integers(0, 256, (16, 24, 3), dtype=np.uint8)
+        gray = rng.integers(0, 256, (16, 24), dtype=np.uint8)
+
+        color_result = MultiModalProcessor.process_image(_encode_image(Image.fromarray(color, "RGB")), "image/png")
+        gray_result = MultiModalProcessor.process_image(_encode_image(Image.fromarray(gray, "L")), "image/png")
+
+        color_metadata = color_result["metadata"]
+        assert color_metadata["mean_brightness"] == pytest.approx(float(np.mean(color)))
+        assert color_metadata["channel_means"] == pytest.approx([float(np.mean(color[:, :, i])) for i in range(3)])
+        assert gray_result["metadata"]["mean_brightness"] == pytest.approx(float(np.mean(gray)))
+        assert gray_result["metadata"]["std_brightness"] == pytest.approx(float(np.std(gray)))
+
+    def test_repeated_image_uses_result_cache(self):
+        image_data = _encode_image(Image.new("RGB", (4, 4), (1, 2, 3)))
+
+        first = MultiModalProcessor.process_image(image_data, "image/png")
+        first["metadata"]["channel_means"].append(99.0)
+        with patch("agent.services._imaging.decode_pixels") as decode_pixels:
+            second = MultiModalProcessor.process_image(image_data, "image/png")
+
+        decode_pixels.assert_not_called()
+        assert second["success"] is True
+        assert second["metadata"]["channel_means"] == [1.0, 2.0, 3.0]
+        assert second["image"].size == (4, 4)
+
+    def test_result_cache_is_bounded_by_bytes(self, monkeypatch):
+        monkeypatch.setattr("agent.services.multimodal._result_cache.max_bytes", 600)
+        images = [_encode_image(Image.new("RGB", (4, 4), (i, i, i))) for i in range(3)]
+
+        for image_data in images:
+            MultiModalProcessor.process_image(image_data, "image/png")
+        with patch("agent.services._imaging.decode_pixels", wraps=_imaging.decode_pixels) as decode_pixels:
+            MultiModalProcessor.process_image(images[-1], "image/png")
+            MultiModalProcessor.process_image(images[0], "image/png")
+
+        # The newest entry fits the budget and is reused; the oldest was evicted
+        assert decode_pixels.call_count == 1
+
+    def test_sha256_only_on_request(self):
+        image_data = _encode_image(Image.new("RGB", (2, 2), (9, 9, 9)))
+        expected = hashlib.sha256(base64.b64decode(image_data)).hexdigest()
+
+        plain = MultiModalProcessor.process_image(image_data, "image/png")
+        audited = MultiModalProcessor.process_image(image_data, "image/png", compute_sha256=True)
+
+        assert "sha256" not in plain["metadata"]
+        assert audited["metadata"]["sha256"] == expected
+
+    def test_cached_metadata_omits_sha256_unless_requested(self):
+        image_data = _encode_image(Image.new("RGB", (2, 2), (4, 5, 6)))
+
+        audited = MultiModalProcessor.process_image(image_data, "image/png", compute_sha256=True)
+        plain = MultiModalProcessor.process_image(image_data, "image/png")
+        audited_again = MultiModalProcessor.process_image(image_data, "image/png", compute_sha256=True)
+
+        assert "sha256" in audited["metadata"]
+        assert "sha256" not in plain["metadata"]
+        assert audited_again["metadata"]["sha256"] == audited["metadata"]["sha256"]
+
+    def test_process_image_lite_skips_pixels_and_hash(self):
+        image_data = _encode_image(Image.new("RGB", (6, 3), (1, 2, 3)))
+
+        with patch("agent.services._imaging.decode_pixels") as decode_pixels:
+            result = MultiModalProcessor.process_image_lite(image_data, "image/png")
+
+        decode_pixels.assert_not_called()
+        metadata = result["metadata"]
+        assert metadata["size"] == (6, 3)
+        assert "hash" not in metadata
+        assert "mean_brightness" not in metadata
+
+    def test_process_invalid_image(self):
+        result = MultiModalProcessor.process_image(base64.b64encode(b"not an image").decode(), "image/png")
+
+        assert result["success"] is False
+        assert "error" in result
+
+
+class TestProcessDocument:
+    def test_process_text_document(self):
+        text = "hello world\nsecond line"
+        doc_data = base64.b64encode(text.encode("utf-8")).decode("utf-8")
+
+        result = MultiModalProcessor.process_document(doc_data, "text/plain")
+
+        assert result["success"] is True
+        metadata = result["metadata"]
+        assert metadata["content"] == text
+        assert metadata["line_count"] == 2
+        assert metadata["word_count"] == 4
+        assert metadata["size_bytes"] == len(text)
+        assert metadata["hash_algo"] in ("xxh3_128", "sha256")
+
+    def test_word_count_across_chunk_boundaries(self, monkeypatch):
+        monkeypatch.setattr("agent.services.multimodal._WORD_COUNT_CHUNK_SIZE", 4)
+        text = "alpha beta  gamma\ndelta \t epsilon zeta "
+        doc_data = base64.b64encode(text.encode("utf-8")).decode("utf-8")
+
+        result = MultiModalProcessor.process_document(doc_data, "text/plain")
+
+        assert result["metadata"]["word_count"] == len(text.split())
+        assert result["metadata"]["line_count"] == len(text.split("\n"))
+
+    def test_document_sha256_on_request(self):
+        doc_data = base64.b64encode(b"audit me").decode("utf-8")
+
+        result = MultiModalProcessor.process_document(doc_data, "text/plain", compute_sha256=True)
+
+        assert result["metadata"]["sha256"] == hashlib.sha256(b"audit me").hexdigest()
+
+    def test_documents_are_not_cached(self):
+        doc_data = base64.b64encode(b'{"user": "data"}').decode("utf-8")
+
+        first = MultiModalProcessor.process_document(doc_data, "application/json")
+        with patch("agent.services.multimodal._json_loads", return_value={}) as json_loads:
+            second = MultiModalProcessor.process_document(doc_data, "application/json")
+
+        json_loads.assert_called_once()
+        assert first["metadata"]["content"] == {"user": "data"}
+        assert second["metadata"]["content"] == {}
+
+    def test_process_json_document(self):
+        payload = json.dumps({"a": 1, "b": [1, 2]}).encode("utf-8")
+        doc_data = base64.b64encode(payload).decode("utf-8")
+
+        result = MultiModalProcessor.process_document(doc_data, "application/json")
+
+        assert result["success"] is True
+        assert result["metadata"]["content"] == {"a": 1, "b": [1, 2]}
+        assert result["metadata"]["keys"] == ["a", "b"]
+
+    def test_json_keeps_wide_integers_exact(self):
+        payload = b'{"id": 123456789012345678901234567890, "small": 7}'
+        doc_data = base64.b64encode(payload).decode("utf-8")
+
+        result = MultiModalProcessor.process_document(doc_data, "application/json")
+
+        assert result["metadata"]["content"] == json.loads(payload)
+        assert multimodal._json_loads(b"[123456789012345678901234567890]") == [123456789012345678901234567890]
+        assert multimodal._json_loads(b"[-9223372036854775809]") == [-9223372036854775809]
+
+    def test_process_invalid_json_document(self):
+        doc_data = base64.b64encode(b"{not json").decode("utf-8")
+
+        result = MultiModalProcessor.process_document(doc_data, "application/json")
+
+        assert result["success"] is True
+        assert "Failed to parse JSON" in result["metadata"]["error"]
+
+
+class TestValidateFileSize:
+    def test_accepts_small_payloads(self):
+        for length in range(0, 9):
+            data = base64.b64encode(b"x" * length).decode("utf-8")
+            assert MultiModalProcessor.validate_file_size(data, "image") is True
+
+    def test_rejects_oversized_payload(self, monkeypatch):
+        monkeypatch.setitem(MultiModalProcessor.MAX_FILE_SIZES, "image", 1)
+        limit = 1024 * 1024
+
+        at_limit = base64.b64encode(b"\0" * limit).decode("utf-8")
+        over_limit = base64.b64encode(b"\0" * (limit + 1)).decode("utf-8")
+
+        assert MultiModalProcessor.validate_file_size(at_limit + "\n", "image") is True
+        assert MultiModalProcessor.validate_file_size(over_limit, "image") is False
+
+    def test_line_wrapped_payload_counts_only_base64(self, monkeypatch):
+        monkeypatch.setitem(MultiModalProcessor.MAX_FILE_SIZES, "image", 1)
+        limit = 1024 * 1024
+
+        under_limit = base64.encodebytes(b"\0" * (limit - 1000)).decode("utf-8")
+        crlf_at_limit = base64.encodebytes(b"\0" * limit).decode("utf-8").replace("\n", "\r\n")
+        over_limit = base64.encodebytes(b"\0" * (limit + 1)).decode("utf-8")
+
+        assert MultiModalProcessor.validate_file_size(under_limit, "image") is True
+        assert MultiModalProcessor.validate_file_size(crlf_at_limit, "image") is True
+        assert MultiModalProcessor.validate_file_size(over_limit, "image") is False
+
+    def test_malformed_payload_is_left_to_the_decoder(self):
+        with patch("agent.services.multimodal._b64decode") as b64decode:
+            assert MultiModalProcessor.validate_file_size("abc", "image") is True
+
+        b64decode.assert_not_called()
+        assert MultiModalProcessor.process_image("abc", "image/png")["success"] is False
+
+    @pytest.mark.parametrize("data", ["AA==AAAA", "QUJD\nREVG", "QUJD!", "QUJ D", "QQ", "QUJD", "QQ==QQ==", "QUJ=\nD"])
+    def test_decoding_matches_stdlib(self, data):
+        try:
+            expected = base64.b64decode(data)
+        except binascii.Error:
+            with pytest.raises(binascii.Error):
+                multimodal._b64decode(data)
+        else:
+            assert multimodal._b64decode(data) == expected
+
+
+class TestExtractParts:
+    def test_extract_all_content_buckets_parts(self):
+        parts = [
+            SimpleNamespace(root=SimpleNamespace(kind="text", text="hello")),
+            _file_part("photo.png", "image/png"),
+            _file_part("report.pdf", "application/pdf"),
+            _file_part("icon.svg", "image/svg+xml"),
+            _file_part("page.html", "text/html"),
+            _file_part("archive.zip", "application/zip"),
+            _file_part("unknown", None),
+            SimpleNamespace(root=SimpleNamespace(kind="data", data={"k": "v"})),
+        ]
+
+        content = MultiModalProcessor.extract_all_content(parts)
+
+        assert content["text"] == ["hello"]
+        assert [item["name"] for item in content["images"]] == ["photo.png", "icon.svg"]
+        assert [item["name"] for item in content["documents"]] == ["report.pdf"]
+        assert [item["name"] for item in content["other"]] == ["page.html", "archive.zip", "unknown", "structured_data"]
+
+    def test_extract_image_and_document_parts(self):
+        parts = [_file_part("photo.jpg", "image/jpeg"), _file_part("notes.txt", "text/plain"), _file_part("x", None)]
+
+        images = MultiModalProcessor.extract_image_parts(parts)
+        documents = MultiModalProcessor.extract_document_parts(parts)
+
+        assert [item["name"] for item in images] == ["photo.jpg"]
+        assert [item["name"] for item in documents] == ["notes.txt"]
+
+    def test_extract_parts_by_type_accepts_prefix_tuple(self):
+        parts = [
+            _file_part("photo.png", "image/png"),
+            _file_part("notes.txt", "text/plain"),
+            _file_part("report.pdf", "application/pdf"),
+            SimpleNamespace(root=SimpleNamespace(kind="text", text="hello")),
+        ]
+
+        assert MultiModalProcessor.extract_parts_by_type(parts, "image/") == parts[:1]
+        assert MultiModalProcessor.extract_parts_by_type(parts, ("image/", "text/")) == parts[:2]
+
+
+class TestImageKernels:
+    def test_numba_channel_sums_match_numpy(self):
+        pytest.importorskip("numba")
+        from agent.services._image_kernels import channel_sums_u8
+
+        pixels = np.random.default_rng(0).integers(0, 256, (1001, 4), dtype=np.uint8)
+
+        assert channel_sums_u8(pixels).tolist() == pixels.sum(axis=0, dtype=np.uint64).tolist()
+
+    def test_warm_up_skipped_without_numba(self):
+        with (
+            patch("agent.services.multimodal.importlib.util.find_spec", return_value=None),
+            patch.object(_imaging, "warm_up") as warm_up,
+        ):
+            MultiModalProcessor.warm_up()
+
+        warm_up.assert_not_called()
+
+    def test_kernel_only_used_after_warm_up(self, monkeypatch):
+        pytest.importorskip("numba")
+        monkeypatch.setattr(_imaging, "_NUMBA_MIN_PIXELS", 1)
+        monkeypatch.setattr(_imaging, "_kernel_ready", False)
+        image_array = np.full((4, 4, 3), 7, dtype=np.uint8)
+
+        with patch.object(_imaging._image_kernels, "channel_sums_u8") as kernel:
+            _imaging.image_statistics(image_array)
+        kernel.assert_not_called()
+
+        with patch.object(_imaging._image_kernels, "warm_up", return_value=False):
+            assert MultiModalProcessor.warm_up() is None
+        assert _imaging._kernel_ready is False
+
+        assert _imaging.warm_up() is True
+        with patch.object(_imaging._image_kernels, "channel_sums_u8", return_value=np.array([112] * 3)) as kernel:
+            stats = _imaging.image_statistics(image_array)
+        kernel.assert_called_once()
+        assert stats["channel_means"] == [7.0, 7.0, 7.0]
+
+
+class TestConvertImageFormat:
+    def test_same_format_returns_source_bytes(self):
+        image_data = _encode_image(Image.new("RGB", (8, 8), (5, 6, 7)))
+        image = MultiModalProcessor.process_image(image_data, "image/png")["image"]
+
+        with patch.object(image, "save") as save:
+            converted = MultiModalProcessor.convert_image_format(image, "png")
+
+        save.assert_not_called()
+        assert converted == base64.b64decode(image_data)
+
+    def test_source_with_exif_is_re_encoded_without_it(self):
+        exif = Image.Exif()
+        exif[0x010F] = "Camera Maker"
+        exif[0x8825] = {2: (51.0, 30.0, 0.0)}
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), (5, 6, 7)).save(buffer, format="JPEG", exif=exif.tobytes())
+        image_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        image = MultiModalProcessor.process_image(image_data, "image/jpeg")["image"]
+
+        converted = MultiModalProcessor.convert_image_format(image, "JPEG")
+
+        assert converted != buffer.getvalue()
+        assert len(Image.open(io.BytesIO(converted)).getexif()) == 0
+
+    def test_edited_image_is_re_encoded(self):
+        image_data = _encode_image(Image.new("RGB", (8, 8), (5, 6, 7)))
+        image = MultiModalProcessor.process_image(image_data, "image/png")["image"]
+
+        ImageDraw.Draw(image).rectangle((0, 0, 3, 3), fill=(200, 0, 0))
+        converted = MultiModalProcessor.convert_image_format(image, "PNG")
+
+        assert converted != base64.b64decode(image_data)
+        assert Image.open(io.BytesIO(converted)).getpixel((1, 1)) == (200, 0, 0)
+
+    def test_resized_image_is_re_encoded(self):
+        image_data = _encode_image(Image.new("RGB", (8, 8), (5, 6, 7)))
+        image = MultiModalProcessor.process_image(image_data, "image/png")["image"]
+
+        MultiModalProcessor.resize_image(image, (4, 4))
+        converted = MultiModalProcessor.convert_image_format(image, "PNG")
+
+        assert Image.open(io.BytesIO(converted)).size == (4, 4)
+
+    def test_different_format_is_re_encoded(self):
+        image_data = _encode_image(Image.new("RGBA", (8, 8), (5, 6, 7, 128)))
+        image = MultiModalProcessor.process_image(image_data, "image/png")["image"]
+
+        converted = MultiModalProcessor.convert_image_format(image, "JPEG")
+
+        assert Image.open(io.BytesIO(converted)).format == "JPEG"
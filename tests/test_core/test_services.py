@@ -1,4 +1,5 @@
 # Import the services to test
+import asyncio
 import sys
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -316,6 +317,42 @@ class TestServiceRegistry:
             assert "valkey" in registry._services
             assert isinstance(registry._services["valkey"], CacheService)
 
+    @pytest.mark.asyncio
+    async def test_health_check_all_reports_errors_and_timeouts(self):
+        with patch.object(Config, "ai_provider", {"project_name": "test", "services": {}}):
+            registry = ServiceRegistry()
+
+        class FailingService(WebAPIService):
+            async def health_check(self):
+                raise RuntimeError("backend down")
+
+        class HangingService(WebAPIService):
+            async def health_check(self):
+                await asyncio.sleep(10)
+
+        class TimingOutService(WebAPIService):
+            async def health_check(self):
+                raise TimeoutError("upstream ping timed out")
+
+        registry.service_instances.update(
+            {
+                "cache": CacheService("cache", {"url": "valkey://localhost:6379"}),
+                "failing": FailingService("failing", {}),
+                "hanging": HangingService("hanging", {}),
+                "timing_out": TimingOutService("timing_out", {}),
+            }
+        )
+
+        with patch("agent.services.registry.HEALTH_CHECK_TIMEOUT", 0.05):
+            results = await registry.health_check_all()
+
+        assert results["cache"] == {"status": "healthy", "url": "valkey://localhost:6379"}
+        assert results["failing"] == {"status": "error", "error": "backend down"}
+        assert results["hanging"]["status"] == "error"
+        assert results["hanging"]["error"] == "Health check timed out after 0.05s"
+        # A TimeoutError raised by the service itself is reported verbatim
+        assert results["timing_out"] == {"status": "error", "error": "upstream ping timed out"}
+
 
 class TestServiceRegistryIntegration:
     def test_full_service_registry_flow_with_mocks(self):
@@ -0,0 +1,90 @@
+import os
+from unittest.mock import patch
+
+import yaml
+from pydantic_settings import BaseSettings
+
+from agent.config.intent import load_intent_config
+from agent.config.yaml_source import YAML_LOADER, YamlConfigSettingsSource, load_yaml_file
+
+
+def _source(path) -> YamlConfigSettingsSource:
+    return YamlConfigSettingsSource(BaseSettings, yaml_file=path)
+
+
+class TestLoadYamlFile:
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        config_file = tmp_path / "config.yml"
+        config_file.write_text("plugins:\n  hello:\n    enabled: true\n")
+
+        with patch("agent.config.yaml_source.yaml.load", wraps=yaml.load) as mock_load:
+            first = load_yaml_file(config_file)
+            first["plugins"]["hello"]["enabled"] = False
+            second = load_yaml_file(str(config_file))
+
+        assert mock_load.call_count == 1
+        assert second == {"plugins": {"hello": {"enabled": True}}}
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        config_file = tmp_path / "config.yml"
+        config_file.write_text("value: 1\n")
+        assert load_yaml_file(config_file) == {"value": 1}
+
+        # Same size, new mtime
+        config_file.write_text("value: 2\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_yaml_file(config_file) == {"value": 2}
+
+        # Atomic replace swaps the inode
+        replacement = tmp_path / "replacement.yml"
+        replacement.write_text("value: 3\n")
+        os.utime(replacement, ns=(config_file.stat().st_atime_ns, config_file.stat().st_mtime_ns))
+        os.replace(replacement, config_file)
+        assert load_yaml_file(config_file) == {"value": 3}
+
+    def test_encodings(self, tmp_path):
+        utf8_file = tmp_path / "utf8.yml"
+        utf8_file.write_text("description: café ☕\n", encoding="utf-8")
+        latin1_file = tmp_path / "latin1.yml"
+        latin1_file.write_text("description: café\n", encoding="latin-1")
+
+        assert load_yaml_file(utf8_file) == {"description": "café ☕"}
+        assert load_yaml_file(latin1_file, encoding="latin-1") == {"description": "café"}
+
+
+class TestYamlConfigSettingsSource:
+    def test_reads_config(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("AGENT_CONFIG_PATH", raising=False)
+        config_file = tmp_path / "agentup.yml"
+        config_file.write_text("name: demo\nversion: 1.2.3\nplugins:\n  hello: {}\n")
+
+        content = _source(config_file)()
+
+        assert content["project_name"] == "demo"
+        assert content["version"] == "1.2.3"
+        assert content["plugins"] == {"hello": {}}
+
+    def test_uses_safe_loader(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("AGENT_CONFIG_PATH", raising=False)
+        config_file = tmp_path / "agentup.yml"
+        config_file.write_text("name: !!python/object/apply:os.getcwd []\n")
+
+        assert YAML_LOADER in (getattr(yaml, "CSafeLoader", None), yaml.SafeLoader)
+        assert _source(config_file)() == {}
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("AGENT_CONFIG_PATH", raising=False)
+
+        assert _source(tmp_path / "missing.yml")() == {}
+
+
+class TestLoadIntentConfig:
+    def test_loads_intent_config(self, tmp_path):
+        config_file = tmp_path / "agentup.yml"
+        config_file.write_text("name: demo\ndescription: Demo agent\n")
+
+        config = load_intent_config(str(config_file))
+
+        assert config.name == "demo"
+        assert config.apiVersion == "v1"
@@ -5,6 +5,8 @@ This module tests the new decorator-based PluginRegistry that replaces
 the old Pluggy-based system.
 """
 
+import importlib.util
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, PropertyMock, patch
@@ -154,6 +156,19 @@ class TestPluginRegistry:
         capability = registry.get_capability("non_existent")
         assert capability is None
 
+    def test_get_capability_uses_registered_definitions(self):
+        """Test capability lookups do not rebuild the plugin's definitions."""
+        registry = PluginRegistry()
+        plugin = _MultiCapabilityPlugin()
+        registry._register_plugin("multi_plugin", plugin)
+
+        with patch.object(plugin, "get_capability_definitions") as mock_definitions:
+            capability = registry.get_capability("cap2")
+
+        mock_definitions.assert_not_called()
+        assert capability.id == "cap2"
+        assert capability is registry.get_capability("cap2")
+
     def test_list_capabilities(self):
         """Test listing all capabilities."""
         registry = PluginRegistry()
@@ -479,6 +494,16 @@ class TestPluginAllowlist:
         # Should have None allowlist on error (fail-secure)
         assert registry.allowed_plugins is None
 
+    def test_blocked_plugins_loaded_as_set(self):
+        """Test blocked plugins are denied even in permissive mode."""
+        config = {"plugin_security": {"mode": "permissive", "blocked_plugins": ["bad-plugin", "bad-plugin"]}}
+
+        registry = PluginRegistry(config)
+
+        assert registry.blocked_plugins == {"bad-plugin"}
+        assert registry._is_plugin_allowed("bad-plugin", None) is False
+        assert registry._is_plugin_allowed("good-plugin", None) is True
+
     def test_is_plugin_allowed_no_allowlist(self):
         """Test plugin allowed check when no allowlist configured."""
         registry = PluginRegistry()
@@ -612,6 +637,14 @@ class TestPluginDiscovery:
         assert "error_plugin" in registry.plugin_definitions
         assert registry.plugin_definitions["error_plugin"].status == PluginStatus.ERROR
 
+        # A second discovery pass does not retry the failed plugin until its distribution changes
+        registry._load_entry_point_plugins()
+        mock_entry_point.load.assert_called_once()
+
+        mock_entry_point.dist.version = "2.0.0"
+        registry._load_entry_point_plugins()
+        assert mock_entry_point.load.call_count == 2
+
     @patch("src.agent.plugins.manager.importlib.metadata.entry_points")
     def test_load_entry_point_plugins_python39_compatibility(self, mock_entry_points):
         """Test Python 3.9 compatibility (no select method)."""
@@ -660,52 +693,62 @@ class TestFilesystemPlugins:
         # Should not load any plugins
         assert len(registry.plugins) == 0
 
-    @patch("src.agent.plugins.manager.Path")
     @patch("src.agent.plugins.manager.logger")
-    def test_load_filesystem_plugins_directory_not_found(self, mock_logger, mock_path):
+    def test_load_filesystem_plugins_directory_not_found(self, mock_logger, tmp_path):
         """Test filesystem plugin loading when directory doesn't exist."""
+        missing_dir = tmp_path / "missing"
         config = {
             "development": {
                 "enabled": True,
-                "filesystem_plugins": {"enabled": True, "allowed_directories": ["~/.agentup/plugins"]},
+                "filesystem_plugins": {"enabled": True, "allowed_directories": [str(missing_dir)]},
             }
         }
 
-        # Mock path that doesn't exist
-        mock_path_instance = Mock()
-        mock_path_instance.expanduser.return_value = mock_path_instance
-        mock_path_instance.exists.return_value = False
-        mock_path.return_value = mock_path_instance
-
         registry = PluginRegistry(config)
         registry._load_filesystem_plugins()
 
         # Should complete without error, no plugins loaded
         assert len(registry.plugins) == 0
+        mock_logger.debug.assert_any_call("Plugin directory not found: %s", missing_dir)
+        mock_logger.error.assert_not_called()
 
-    @patch("src.agent.plugins.manager.Path")
-    def test_load_filesystem_plugins_path_not_directory(self, mock_path):
-        """Test filesystem plugin loading when path is not a directory."""
+    def test_load_filesystem_plugins_path_not_directory(self, tmp_path):
+        """Test filesystem plugin loading when the plugin directory only contains files."""
+        (tmp_path / "README.md").write_text("not a plugin")
         config = {
             "development": {
                 "enabled": True,
-                "filesystem_plugins": {"enabled": True, "allowed_directories": ["~/.agentup/plugins"]},
+                "filesystem_plugins": {"enabled": True, "allowed_directories": [str(tmp_path)]},
             }
         }
 
-        # Mock path that exists but is not a directory
-        mock_path_instance = Mock()
-        mock_path_instance.expanduser.return_value = mock_path_instance
-        mock_path_instance.exists.return_value = True
-        mock_path_instance.iterdir.return_value = []  # Empty directory
-        mock_path.return_value = mock_path_instance
-
         registry = PluginRegistry(config)
-        registry._load_filesystem_plugins()
+        with patch.object(registry, "_load_filesystem_plugin") as mock_load:
+            registry._load_filesystem_plugins()
 
         # Should complete without error
+        mock_load.assert_not_called()
         assert len(registry.plugins) == 0
 
+    def test_load_filesystem_plugins_visits_each_directory(self, tmp_path):
+        """Test filesystem plugin loading only descends into directories."""
+        (tmp_path / "first").mkdir()
+        (tmp_path / "second").mkdir()
+        (tmp_path / "notes.txt").write_text("ignored")
+        config = {
+            "development": {
+                "enabled": True,
+                "filesystem_plugins": {"enabled": True, "allowed_directories": [str(tmp_path)]},
+            }
+        }
+
+        registry = PluginRegistry(config)
+        with patch.object(registry, "_load_filesystem_plugin") as mock_load:
+            registry._load_filesystem_plugins()
+
+        loaded = sorted(call.args[0] for call in mock_load.call_args_list)
+        assert loaded == [tmp_path / "first", tmp_path / "second"]
+
     def test_load_filesystem_plugin_with_plugin_py(self):
         """Test loading filesystem plugin with plugin.py file."""
         registry = PluginRegistry()
@@ -735,6 +778,106 @@ class TestFilePlugin(Plugin):
             assert "fs_test_plugin" in registry.plugins
             assert len(registry.plugins) == 1
 
+    def test_load_filesystem_plugin_reuses_unchanged_module(self, tmp_path):
+        """Test a second discovery pass only re-executes plugin code after it changes."""
+        plugin_dir = tmp_path / "counting_plugin"
+        plugin_dir.mkdir()
+        plugin_file = plugin_dir / "plugin.py"
+        plugin_file.write_text(
+            """
+from src.agent.plugins.base import Plugin
+
+class CountingPlugin(Plugin):
+    pass
+"""
+        )
+
+        registry = PluginRegistry()
+        with patch(
+            "src.agent.plugins.manager.importlib.util.spec_from_file_location",
+            wraps=importlib.util.spec_from_file_location,
+        ) as mock_spec:
+            registry._load_filesystem_plugin(plugin_dir)
+            registry._load_filesystem_plugin(plugin_dir)
+            assert mock_spec.call_count == 1
+
+            stat = plugin_file.stat()
+            os.utime(plugin_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            registry._load_filesystem_plugin(plugin_dir)
+            assert mock_spec.call_count == 2
+
+        assert "fs_counting_plugin" in registry.plugins
+
+    def test_failed_filesystem_plugin_is_retried_after_fix(self, tmp_path):
+        """Test a failed filesystem plugin is skipped until its entry file changes."""
+        plugin_dir = tmp_path / "broken_plugin"
+        plugin_dir.mkdir()
+        plugin_file = plugin_dir / "plugin.py"
+        plugin_file.write_text("raise RuntimeError('broken')\n")
+
+        registry = PluginRegistry()
+        with pytest.raises(RuntimeError):
+            registry._load_filesystem_plugin(plugin_dir)
+
+        with patch("src.agent.plugins.manager.importlib.util.spec_from_file_location") as mock_spec:
+            registry._load_filesystem_plugin(plugin_dir)
+        mock_spec.assert_not_called()
+
+        stat = plugin_file.stat()
+        plugin_file.write_text(
+            """
+from src.agent.plugins.base import Plugin
+
+class FixedPlugin(Plugin):
+    pass
+"""
+        )
+        os.utime(plugin_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        registry._load_filesystem_plugin(plugin_dir)
+
+        assert "fs_broken_plugin" in registry.plugins
+        assert "fs_broken_plugin" not in registry._failed_plugins
+
+    def test_blocked_filesystem_plugin_is_not_imported(self, tmp_path):
+        """Test blocked filesystem plugins are skipped before their code runs."""
+        plugin_dir = tmp_path / "blocked_plugin"
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.py").write_text("raise RuntimeError('should not be imported')\n")
+
+        registry = PluginRegistry({"plugin_security": {"blocked_plugins": ["fs_blocked_plugin"]}})
+        with patch("src.agent.plugins.manager.importlib.util.spec_from_file_location") as mock_spec:
+            registry._load_filesystem_plugin(plugin_dir)
+
+        mock_spec.assert_not_called()
+        assert len(registry.plugins) == 0
+
+    def test_load_filesystem_plugin_entry_file(self, tmp_path):
+        """Test plugin.py is preferred over __init__.py and a directory without either is skipped."""
+        plugin_code = """
+from src.agent.plugins.base import Plugin
+
+class {name}(Plugin):
+    pass
+"""
+        both_dir = tmp_path / "both"
+        both_dir.mkdir()
+        (both_dir / "plugin.py").write_text(plugin_code.format(name="FromPluginPy"))
+        (both_dir / "__init__.py").write_text(plugin_code.format(name="FromInitPy"))
+        init_dir = tmp_path / "init_only"
+        init_dir.mkdir()
+        (init_dir / "__init__.py").write_text(plugin_code.format(name="InitOnly"))
+        empty_dir = tmp_path / "empty"
+        empty_dir.mkdir()
+        (empty_dir / "README.md").write_text("no code here")
+
+        registry = PluginRegistry()
+        for plugin_dir in (both_dir, init_dir, empty_dir):
+            registry._load_filesystem_plugin(plugin_dir)
+
+        assert type(registry.plugins["fs_both"]).__name__ == "FromPluginPy"
+        assert type(registry.plugins["fs_init_only"]).__name__ == "InitOnly"
+        assert "fs_empty" not in registry.plugins
+
     def test_load_filesystem_plugin_no_plugin_class(self):
         """Test loading filesystem plugin with no Plugin class."""
         registry = PluginRegistry()
@@ -3,6 +3,7 @@ Tests for AgentUp state management models.
 """
 
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
@@ -19,6 +20,8 @@ from agent.state.model import (
     StateOperationType,
     StateVariable,
     StateVariableType,
+    decode_history,
+    encode_history,
 )
 
 
@@ -120,6 +123,24 @@ class TestStateVariable:
         )
         assert not fresh_var.is_expired
 
+    def test_expiry_follows_updated_at_and_ttl(self):
+        past_time = datetime.utcnow() - timedelta(seconds=10)
+        var = StateVariable(key="test", value="test", type_name=StateVariableType.STRING, ttl=5, updated_at=past_time)
+
+        assert var.expires_at_ts == pytest.approx((past_time - datetime(1970, 1, 1)).total_seconds() + 5, abs=1e-3)
+        assert var.is_expired
+
+        var.ttl = 60
+        assert not var.is_expired
+
+        var.ttl = 5
+        var.touch()
+        assert not var.is_expired
+        assert "_expiry" not in var.model_dump()
+
+        var.ttl = None
+        assert var.expires_at_ts is None
+
     def test_touch_method(self):
         var = StateVariable(key="test", value="test", type_name=StateVariableType.STRING)
         original_version = var.version
@@ -194,7 +215,10 @@ class TestConversationMessage:
         large_content = "x" * (1_000_001)  # Over 1MB
         with pytest.raises(ValidationError) as exc_info:
             ConversationMessage(id="test", role=ConversationRole.USER, content=large_content)
-        assert "too large" in str(exc_info.value)
+        assert exc_info.value.errors()[0]["type"] == "string_too_long"
+
+        # Exactly at the limit is accepted
+        ConversationMessage(id="test", role=ConversationRole.USER, content="x" * 1_000_000)
 
     def test_message_id_validation(self):
         # Valid IDs
@@ -267,6 +291,36 @@ class TestConversationState:
         assert state.variables["user_name"].ttl == 3600
         assert state.variables["user_age"].ttl is None
 
+    def test_set_variable_uses_single_timestamp(self):
+        state = ConversationState(context_id="test")
+
+        state.set_variable("counter", 1)
+        var = state.variables["counter"]
+        assert var.created_at == var.updated_at == state.updated_at
+
+        state.set_variable("counter", 2)
+        assert var.version == 2
+        assert var.updated_at == state.updated_at
+        assert var.updated_at >= var.created_at
+
+    def test_set_variable_still_checks_key_and_ttl(self):
+        state = ConversationState(context_id="test")
+
+        with pytest.raises(ValueError):
+            state.set_variable("bad key", "value")
+        with pytest.raises(ValueError):
+            state.set_variable("key", "value", ttl=0)
+        with pytest.raises(ValidationError):
+            state.set_variable("bad key", "value", validate=True)
+
+        assert not state.variables
+
+        state.set_variable("fast", "value")
+        state.set_variable("checked", "value", validate=True)
+        fast, checked = state.variables["fast"].model_dump(), state.variables["checked"].model_dump()
+        assert fast.keys() == checked.keys()
+        assert fast["type_name"] == checked["type_name"] == StateVariableType.STRING
+
     def test_variable_count_limit(self):
         state = ConversationState(context_id="test", max_variable_count=2)
 
@@ -352,6 +406,112 @@ class TestConversationState:
         assert summary.last_message_at == messages[-1].timestamp
         assert summary.topics == ["greeting", "casual"]
 
+    def test_history_limit_without_summarize_keeps_newest(self):
+        state = ConversationState(context_id="test", max_history_size=3, auto_summarize=False)
+        history = state.history
+
+        for i in range(5):
+            state.add_message(ConversationMessage(id=f"msg{i}", role=ConversationRole.USER, content="x"))
+
+        assert state.history is history
+        assert [m.id for m in state.history] == ["msg2", "msg3", "msg4"]
+        assert state.archived_messages == 2
+
+    @pytest.mark.parametrize("auto_summarize", [True, False])
+    def test_get_message_by_id(self, auto_summarize):
+        state = ConversationState(context_id="test", max_history_size=4, auto_summarize=auto_summarize)
+
+        for i in range(6):
+            state.add_message(ConversationMessage(id=f"msg{i}", role=ConversationRole.USER, content="x"))
+        reply = ConversationMessage(id="reply", role=ConversationRole.AGENT, content="y", reply_to="msg5")
+        state.add_message(reply)
+
+        assert state.get_message("reply") is reply
+        assert state.get_message(reply.reply_to) is state.history[-2]
+        assert state.get_message("msg0") is None
+        assert all(state.get_message(msg.id) is msg for msg in state.history)
+
+        restored = ConversationState.model_validate(state.model_dump())
+        assert restored.get_message("reply") == reply
+
+    def test_get_message_follows_direct_history_edits(self):
+        state = ConversationState(context_id="test")
+        for i in range(3):
+            state.add_message(ConversationMessage(id=f"msg{i}", role=ConversationRole.USER, content="x"))
+
+        replacement = ConversationMessage(id="new", role=ConversationRole.AGENT, content="y")
+        state.history[0] = replacement
+        assert state.get_message("msg0") is None
+        assert state.get_message("new") is replacement
+
+        del state.history[:2]
+        assert state.get_message("msg1") is None
+        assert state.get_message("msg2") is state.history[0]
+
+        state.history = [ConversationMessage(id="only", role=ConversationRole.USER, content="z")]
+        assert state.get_message("msg2") is None
+        assert state.get_message("only") is state.history[0]
+
+    def test_get_message_miss_does_not_rebuild_index(self):
+        state = ConversationState(context_id="test", max_history_size=4, auto_summarize=False)
+        for i in range(6):
+            state.add_message(ConversationMessage(id=f"msg{i}", role=ConversationRole.USER, content="x"))
+
+        with patch.object(ConversationState, "_reindex") as reindex:
+            assert state.get_message("msg0") is None
+            assert state.get_message("unknown") is None
+
+        reindex.assert_not_called()
+
+    @pytest.mark.parametrize("auto_summarize", [True, False])
+    def test_summary_stats_track_trimmed_history(self, auto_summarize):
+        state = ConversationState(context_id="test", max_history_size=4, auto_summarize=auto_summarize)
+        roles = [ConversationRole.USER, ConversationRole.AGENT, ConversationRole.SYSTEM]
+
+        for i in range(11):
+            state.add_message(ConversationMessage(id=str(i), role=roles[i % 3], content="x", tokens=i))
+
+        summary = state.get_summary_stats()
+        assert summary.user_messages == sum(1 for m in state.history if m.role == ConversationRole.USER)
+        assert summary.agent_messages == sum(1 for m in state.history if m.role == ConversationRole.AGENT)
+        assert summary.total_tokens == sum(m.tokens for m in state.history)
+        assert summary.total_messages == 11
+
+        restored = ConversationState.model_validate(state.model_dump())
+        assert restored.get_summary_stats() == summary
+
+    def test_summary_stats_recount_after_direct_history_edits(self):
+        state = ConversationState(context_id="test")
+        message = ConversationMessage(id="a", role=ConversationRole.USER, content="x")
+        state.add_message(message)
+
+        message.tokens = 50
+        state.recount()
+        assert state.get_summary_stats().total_tokens == 50
+
+        state.history[0] = ConversationMessage(id="b", role=ConversationRole.AGENT, content="x", tokens=2)
+        state.history.append(ConversationMessage(id="c", role=ConversationRole.AGENT, content="x", tokens=4))
+        state.recount()
+        summary = state.get_summary_stats()
+        assert (summary.user_messages, summary.agent_messages, summary.total_tokens) == (0, 2, 6)
+
+        state.history = [ConversationMessage(id="d", role=ConversationRole.USER, content="x", tokens=1)]
+        state.recount()
+        summary = state.get_summary_stats()
+        assert (summary.user_messages, summary.agent_messages, summary.total_tokens) == (1, 0, 1)
+
+    def test_summary_stats_do_not_walk_history(self):
+        state = ConversationState(context_id="test")
+        for i in range(5):
+            state.add_message(ConversationMessage(id=str(i), role=ConversationRole.USER, content="x", tokens=1))
+
+        with patch("agent.state.model._tally_messages") as tally:
+            state.add_message(ConversationMessage(id="5", role=ConversationRole.AGENT, content="x", tokens=2))
+            summary = state.get_summary_stats()
+
+        tally.assert_not_called()
+        assert (summary.user_messages, summary.agent_messages, summary.total_tokens) == (5, 1, 7)
+
     def test_context_id_validation(self):
         # Valid IDs
         ConversationState(context_id="conv_123")
@@ -477,6 +637,14 @@ class TestStateOperation:
         assert operation.error_message == "Key not found"
         assert operation.duration_ms == 5.2
 
+    def test_operation_is_immutable(self):
+        operation = StateOperation(
+            operation_id="op_1", operation_type=StateOperationType.DELETE, context_id="conv_1", success=True
+        )
+
+        with pytest.raises(ValidationError):
+            operation.success = False
+
 
 class TestStateMetrics:
     def test_state_metrics(self):
@@ -626,3 +794,55 @@ class TestModelIntegration:
             state.set_variable(key, value)
             assert state.variables[key].type_name == expected_type
             assert state.variables[key].value == value
+
+    def test_variable_type_detection_for_subclasses(self):
+        from collections import OrderedDict
+        from enum import IntEnum
+
+        class Level(IntEnum):
+            LOW = 1
+
+        state = ConversationState(context_id="type_test")
+        state.set_variable("ordered", OrderedDict(a=1))
+        state.set_variable("level", Level.LOW)
+        state.set_variable("other", None)
+
+        assert state.variables["ordered"].type_name == StateVariableType.DICT
+        assert state.variables["level"].type_name == StateVariableType.INTEGER
+        assert state.variables["other"].type_name == StateVariableType.JSON
+
+
+class TestHistorySerialization:
+    @pytest.fixture
+    def state(self):
+        state = ConversationState(context_id="codec")
+        state.add_message(ConversationMessage(id="1", role=ConversationRole.USER, content="Hi", tokens=1))
+        state.add_message(
+            ConversationMessage(
+                id="2",
+                role=ConversationRole.TOOL,
+                content="Done",
+                tool_calls=[{"tool": "search", "args": [1, 2]}],
+                metadata={"source": "test"},
+                reply_to="1",
+            )
+        )
+        return state
+
+    def test_round_trip(self, state):
+        assert decode_history(encode_history(state)) == state.history
+
+    def test_fast_codec_matches_pydantic(self, state):
+        pytest.importorskip("msgspec")
+
+        fast = encode_history(state, fast=True)
+
+        assert fast == encode_history(state)
+        assert decode_history(fast, fast=True) == state.history
+        assert decode_history(encode_history(state), fast=True) == state.history
+
+    def test_fast_decode_enforces_message_limits(self):
+        msgspec = pytest.importorskip("msgspec")
+
+        with pytest.raises(msgspec.ValidationError):
+            decode_history(b'[{"id": "", "role": "user", "content": "x"}]', fast=True)